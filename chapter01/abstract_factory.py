@@ -1,3 +1,4 @@
+from world_registry import worlds
 
 # Frog game
 
@@ -8,10 +9,10 @@ class Frog:
     def __str__(self):
         return self.name
 
-    def interact_with(self, obstacle):
+    def interact_with(self, obstacle, sink=print):
         act = obstacle.action()
         msg = f'{self} the Frog encounters {obstacle} and {act}!'
-        print(msg)
+        sink(msg)
 
 class Bug:
     def __str__(self):
@@ -44,10 +45,10 @@ class Wizard:
     def __str__(self):
         return self.name
 
-    def interact_with(self, obstacle):
+    def interact_with(self, obstacle, sink=print):
         act = obstacle.action()
         msg = f'{self} the Wizard battles against {obstacle} and {act}!'
-        print(msg)
+        sink(msg)
 
 class Ork:
     def __str__(self):
@@ -76,24 +77,24 @@ class GameEnvironment:
         self.hero = factory.make_character()
         self.obstacle = factory.make_obstacle()
 
-    def play(self):
-        self.hero.interact_with(self.obstacle)
+    def play(self, sink=print):
+        self.hero.interact_with(self.obstacle, sink)
 
-def validate_age(name):
+def validate_world(name):
+    world = input(f'Welcome {name}. Which world do you want to play '
+                  f'({", ".join(worlds.names())})? ')
     try:
-        age = input(f'Welcome {name}. How old are you? ')
-        age = int(age)
+        game = worlds.get(world)
     except ValueError as err:
-        print(f"Age {age} is invalid, please try again...")
-        return (False, age)
-    return (True, age)
+        print(f"World {world} is unknown, please try again...")
+        return (False, None)
+    return (True, game)
 
 def main():
     name = input("Hello. What's your name? ")
     valid_input = False
     while not valid_input:
-        valid_input, age = validate_age(name)
-    game = FrogWorld if age < 18 else WizardWorld
+        valid_input, game = validate_world(name)
     environment = GameEnvironment(game(name))
     environment.play()
 
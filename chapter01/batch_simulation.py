@@ -0,0 +1,84 @@
+import contextlib
+import io
+import time
+import tracemalloc
+
+from abstract_factory import FrogWorld, GameEnvironment, WizardWorld
+
+SAMPLE_SIZE = 10000 # environments kept alive to measure memory
+
+
+def drop(msg):
+    pass
+
+
+class BatchSimulation:
+    """Build and play many game environments without any user input.
+
+    Interaction messages go to sink, a callable taking one string;
+    they are dropped by default.
+    """
+
+    def __init__(self, worlds=(FrogWorld, WizardWorld), player_name='bot', sink=drop):
+        # the worlds announce themselves when created, keep that quiet
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.factories = [world(player_name) for world in worlds]
+        self.sink = sink
+
+    def run(self, count):
+        """Play count environments, cycling over the worlds, and return
+        the number of interactions per second."""
+        factories = self.factories
+        nb_factories = len(factories)
+        sink = self.sink
+        start = time.perf_counter()
+        for i in range(count):
+            GameEnvironment(factories[i % nb_factories]).play(sink)
+        elapsed = time.perf_counter() - start
+        return count / elapsed if elapsed else float('inf')
+
+    def memory_per_environment(self, count=SAMPLE_SIZE):
+        """Return the (blocks, bytes) an environment keeps alive once
+        played, measured by keeping count environments alive while
+        tracing, and the peak bytes allocated while playing it."""
+        factories = self.factories
+        nb_factories = len(factories)
+        sink = self.sink
+        play_peak = 0
+        tracemalloc.start()
+        try:
+            before = tracemalloc.take_snapshot()
+            environments = []
+            for i in range(count):
+                environment = GameEnvironment(factories[i % nb_factories])
+                # the messages and actions of play() are freed before
+                # the second snapshot, so catch them at their peak
+                current, _ = tracemalloc.get_traced_memory()
+                tracemalloc.reset_peak()
+                environment.play(sink)
+                play_peak += tracemalloc.get_traced_memory()[1] - current
+                environments.append(environment)
+            after = tracemalloc.take_snapshot()
+        finally:
+            tracemalloc.stop()
+        stats = after.compare_to(before, 'filename')
+        blocks = sum(stat.count_diff for stat in stats)
+        size = sum(stat.size_diff for stat in stats)
+        # do not count the list holding the environments
+        size -= environments.__sizeof__()
+        blocks -= 1
+        return blocks / count, size / count, play_peak / count
+
+
+def main():
+    simulation = BatchSimulation()
+    for count in (10000, 100000, 1000000):
+        rate = simulation.run(count)
+        print(f'{count} environments: {rate:,.0f} interactions/s')
+    blocks, size, play_peak = simulation.memory_per_environment()
+    print(f'retained per environment: {blocks:.1f} blocks, {size:.0f} bytes')
+    print(f'peak allocated by play(): {play_peak:.0f} bytes')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+import glob
+import os
+from collections import deque, namedtuple
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from factory_method import dataextraction_factory
+
+ExtractionResult = namedtuple('ExtractionResult', 'path data error')
+
+
+def _extract(filepath):
+    return dataextraction_factory(filepath).parsed_data
+
+
+def _list_files(source):
+    if os.path.isdir(source):
+        paths = []
+        for ext in ('json', 'xml'):
+            paths.extend(glob.glob(os.path.join(source, f'*.{ext}')))
+    else:
+        paths = glob.glob(source)
+    return sorted(paths)
+
+
+def _result(path, future):
+    error = future.exception()
+    if error is not None:
+        return ExtractionResult(path, None, error)
+    return ExtractionResult(path, future.result(), None)
+
+
+def extract_many(source, max_workers=None, max_in_flight=None, ordered=True):
+    """Extract every file of a directory (or matching a glob pattern)
+    in a process pool.
+
+    At most max_in_flight files are submitted at any time. Results are
+    yielded in path order, or as soon as they are ready if ordered is
+    False. A file that fails is reported through the error field of its
+    result instead of aborting the batch.
+    """
+    paths = iter(_list_files(source))
+    if max_in_flight is None:
+        max_in_flight = 2 * (max_workers or os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        pending = deque()
+
+        def submit_next():
+            for path in paths:
+                pending.append((path, executor.submit(_extract, path)))
+                return True
+            return False
+
+        while len(pending) < max_in_flight and submit_next():
+            pass
+
+        while pending:
+            if ordered:
+                path, future = pending.popleft()
+                wait([future])
+                yield _result(path, future)
+            else:
+                done, _ = wait([f for _, f in pending], return_when=FIRST_COMPLETED)
+                for item in [item for item in pending if item[1] in done]:
+                    pending.remove(item)
+                    yield _result(*item)
+            while len(pending) < max_in_flight and submit_next():
+                pass
+
+
+def main():
+    for result in extract_many('data'):
+        if result.error is not None:
+            print(f'{result.path}: failed ({result.error!r})')
+            continue
+        data = result.data
+        if not isinstance(data, list):
+            # an XML tree, count the children of its root
+            data = data.getroot()
+        print(f'{result.path}: {len(data)} records')
+
+
+if __name__ == '__main__':
+    main()
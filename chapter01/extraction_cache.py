@@ -0,0 +1,120 @@
+import hashlib
+import os
+import pickle
+
+MAX_CACHE_BYTES = 256 * 1024 * 1024
+HASH_BLOCK_SIZE = 1024 * 1024
+
+_MISSING = object()
+
+
+class ParsedDataCache:
+    """On-disk cache of parsed documents, keyed by the identity of the
+    source file (path, size, mtime and content hash).
+
+    Entries are pickled with the highest protocol. When the cache grows
+    beyond max_bytes, the least recently used entries are evicted.
+    """
+
+    def __init__(self, directory, max_bytes=MAX_CACHE_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def _key(self, filepath):
+        stat = os.stat(filepath)
+        digest = hashlib.blake2b(digest_size=20)
+        digest.update(os.path.abspath(filepath).encode('utf-8'))
+        digest.update(f'{stat.st_size}:{stat.st_mtime_ns}'.encode('ascii'))
+        with open(filepath, mode='rb') as f:
+            for block in iter(lambda: f.read(HASH_BLOCK_SIZE), b''):
+                digest.update(block)
+        return digest.hexdigest()
+
+    def _entry_path(self, key):
+        return os.path.join(self.directory, f'{key}.pickle')
+
+    def _get(self, key, default):
+        entry = self._entry_path(key)
+        try:
+            with open(entry, mode='rb') as f:
+                data = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            self.misses += 1
+            return default
+        # mark the entry as recently used
+        os.utime(entry)
+        self.hits += 1
+        return data
+
+    def _put(self, key, data):
+        entry = self._entry_path(key)
+        tmp = f'{entry}.{os.getpid()}.tmp'
+        with open(tmp, mode='wb') as f:
+            pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, entry)
+        self._evict()
+
+    def get(self, filepath, default=None):
+        return self._get(self._key(filepath), default)
+
+    def put(self, filepath, data):
+        self._put(self._key(filepath), data)
+
+    def load(self, filepath, parse):
+        """Return the cached data of filepath, or else parse(filepath)
+        and cache it, hashing the file only once."""
+        key = self._key(filepath)
+        data = self._get(key, _MISSING)
+        if data is _MISSING:
+            data = parse(filepath)
+            self._put(key, data)
+        return data
+
+    def _evict(self):
+        entries = []
+        for name in os.listdir(self.directory):
+            if not name.endswith('.pickle'):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime_ns, stat.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+            self.evictions += 1
+
+    def clear(self):
+        for name in os.listdir(self.directory):
+            if name.endswith('.pickle'):
+                os.remove(os.path.join(self.directory, name))
+
+    def __str__(self):
+        return (f'hits: {self.hits}, misses: {self.misses}, '
+                f'evictions: {self.evictions}')
+
+
+def main():
+    from factory_method import extract_data_from
+
+    cache = ParsedDataCache('.extraction_cache')
+    for _ in range(2):
+        for filepath in ('data/movies.json', 'data/person.xml'):
+            extract_data_from(filepath, cache=cache)
+    print(cache)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,43 +1,239 @@
 import json
+import os
+import pathlib
+import sqlite3
+import sys
+import time
 import xml.etree.ElementTree as etree
+from collections import defaultdict
+
+CHUNK_SIZE = 64 * 1024 # in characters, for the streaming extractors
+FETCH_SIZE = 1000 # rows per fetchmany() batch of the SQLite extractor
+SQLITE_EXTENSIONS = ('sq3', 'sqlite', 'sqlite3', 'db')
+WHITESPACE = (' ', '\t', '\r', '\n')
 
 
 class JSONDataExtractor:
 
-    def __init__(self, filepath):
-        self.data = dict()
+    def __init__(self, filepath, cache=None):
+        if cache is not None:
+            self.data = cache.load(filepath, self._parse)
+        else:
+            self.data = self._parse(filepath)
+
+    @staticmethod
+    def _parse(filepath):
         with open(filepath, mode='r', encoding='utf-8') as f:
-            self.data = json.load(f)
+            return json.load(f)
 
     @property
     def parsed_data(self):
         return self.data
 
 
+class XMLIndex:
+    """Index the elements of a parsed XML document by tag and by
+    (tag, child tag, child text), so that equality lookups such as
+    ".//person[lastName='Liar']" do not walk the whole tree."""
+
+    def __init__(self, tree):
+        start = time.perf_counter()
+        self.by_tag = defaultdict(list)
+        self.by_child_text = defaultdict(list)
+        for elem in tree.iter():
+            self.by_tag[elem.tag].append(elem)
+            for child in elem:
+                if len(child) == 0 and child.text is not None:
+                    key = (elem.tag, child.tag, child.text.strip())
+                    self.by_child_text[key].append(elem)
+        self.build_time = time.perf_counter() - start
+
+    def find_all(self, tag):
+        return self.by_tag.get(tag, [])
+
+    def find_by(self, tag, child_tag, value):
+        return self.by_child_text.get((tag, child_tag, value), [])
+
+    @property
+    def memory_usage(self):
+        """Approximate size in bytes of the index structures
+        (the indexed elements themselves belong to the tree)."""
+        size = 0
+        for index in (self.by_tag, self.by_child_text):
+            size += sys.getsizeof(index)
+            for key, elems in index.items():
+                size += sys.getsizeof(key) + sys.getsizeof(elems)
+        return size
+
+
 class XMLDataExtractor:
 
-    def __init__(self, filepath):
-        self.tree =  etree.parse(filepath)
+    def __init__(self, filepath, cache=None):
+        if cache is not None:
+            self.tree = cache.load(filepath, etree.parse)
+        else:
+            self.tree = etree.parse(filepath)
+        self._index = None
 
     @property
     def parsed_data(self):
         return self.tree
 
+    @property
+    def index(self):
+        if self._index is None:
+            self._index = XMLIndex(self.tree)
+        return self._index
+
+
+class JSONStreamDataExtractor:
+    """Yield the items of a top-level JSON array one at a time,
+    without loading the whole document in memory."""
+
+    def __init__(self, filepath, chunk_size=CHUNK_SIZE):
+        self.filepath = filepath
+        self.chunk_size = chunk_size
+
+    def records(self):
+        decoder = json.JSONDecoder()
+        with open(self.filepath, mode='r', encoding='utf-8') as f:
+            buffer, pos, eof = '', 0, False
+            expected = '['
+            while True:
+                # skip whitespace and separators, refilling as needed
+                while True:
+                    while pos < len(buffer) and buffer[pos] in WHITESPACE:
+                        pos += 1
+                    if pos < len(buffer) or eof:
+                        break
+                    buffer, pos = f.read(self.chunk_size), 0
+                    eof = not buffer
+                if expected:
+                    if buffer[pos:pos + 1] != expected:
+                        raise ValueError(f'Expected a JSON array in {self.filepath}')
+                    pos += 1
+                    expected = None
+                    continue
+                if buffer[pos:pos + 1] == ']':
+                    return
+                if buffer[pos:pos + 1] == ',':
+                    pos += 1
+                    continue
+                try:
+                    record, end = decoder.raw_decode(buffer, pos)
+                except json.JSONDecodeError:
+                    # the current record is split between two chunks
+                    if eof:
+                        raise
+                    chunk = f.read(self.chunk_size)
+                    eof = not chunk
+                    buffer, pos = buffer[pos:] + chunk, 0
+                    continue
+                # a number cut at the end of the buffer decodes to a shorter
+                # one ('1.' gives 1), so make sure the record is complete
+                if not eof and buffer[end:end + 1] not in WHITESPACE + (',', ']'):
+                    chunk = f.read(self.chunk_size)
+                    eof = not chunk
+                    buffer, pos = buffer[pos:] + chunk, 0
+                    continue
+                pos = end
+                yield record
+
+    @property
+    def parsed_data(self):
+        return list(self.records())
+
 
-def dataextraction_factory(filepath):
+class XMLStreamDataExtractor:
+    """Yield the children of the root XML element one at a time,
+    clearing each of them once it has been consumed."""
+
+    def __init__(self, filepath):
+        self.filepath = filepath
+
+    def records(self):
+        depth = 0
+        root = None
+        for event, elem in etree.iterparse(self.filepath, events=('start', 'end')):
+            if event == 'start':
+                if root is None:
+                    root = elem
+                depth += 1
+                continue
+            depth -= 1
+            if depth == 1:
+                yield elem
+                # drop the records already seen to keep memory flat
+                root.clear()
+
+    @property
+    def parsed_data(self):
+        return etree.parse(self.filepath)
+
+
+class SQLiteDataExtractor:
+    """Stream the rows of a SQLite table in fetchmany() batches, so that
+    even a very large table is processed in constant memory."""
+
+    def __init__(self, filepath, table=None, fetch_size=FETCH_SIZE):
+        if not os.path.isfile(filepath):
+            raise ValueError(f'No such SQLite database: {filepath}')
+        self.filepath = filepath
+        self.table = table
+        self.fetch_size = fetch_size
+
+    def _connect(self):
+        # as_uri() escapes the characters with a meaning in URIs (?, #, %)
+        uri = f'{pathlib.Path(self.filepath).resolve().as_uri()}?mode=ro'
+        conn = sqlite3.connect(uri, uri=True)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _table_name(self, conn):
+        if self.table is not None:
+            return self.table
+        row = conn.execute("SELECT name FROM sqlite_master WHERE type = 'table' "
+                           "ORDER BY rowid LIMIT 1").fetchone()
+        if row is None:
+            raise ValueError(f'No table found in {self.filepath}')
+        return row['name']
+
+    def records(self):
+        conn = self._connect()
+        try:
+            table = self._table_name(conn).replace('"', '""')
+            cursor = conn.execute(f'SELECT * FROM "{table}"')
+            while True:
+                rows = cursor.fetchmany(self.fetch_size)
+                if not rows:
+                    break
+                yield from rows
+        finally:
+            conn.close()
+
+    @property
+    def parsed_data(self):
+        return [dict(row) for row in self.records()]
+
+
+def dataextraction_factory(filepath, streaming=False, cache=None):
     if filepath.endswith('json'):
-        extractor = JSONDataExtractor
+        extractor = JSONStreamDataExtractor if streaming else JSONDataExtractor
     elif filepath.endswith('xml'):
-        extractor = XMLDataExtractor
+        extractor = XMLStreamDataExtractor if streaming else XMLDataExtractor
+    elif filepath.endswith(SQLITE_EXTENSIONS):
+        extractor = SQLiteDataExtractor
     else:
         raise ValueError('Cannot extract data from {}'.format(filepath))
+    if cache is not None and extractor in (JSONDataExtractor, XMLDataExtractor):
+        return extractor(filepath, cache=cache)
     return extractor(filepath)
 
 
-def extract_data_from(filepath):
+def extract_data_from(filepath, streaming=False, cache=None):
     factory_obj = None
     try:
-        factory_obj = dataextraction_factory(filepath)
+        factory_obj = dataextraction_factory(filepath, streaming, cache)
     except ValueError as e:
         print(e)
     return factory_obj
@@ -64,9 +260,11 @@ def main():
         print()
 
     xml_factory = extract_data_from('data/person.xml')
-    xml_data = xml_factory.parsed_data
-    liars = xml_data.findall(f".//person[lastName='Liar']")
+    index = xml_factory.index
+    liars = index.find_by('person', 'lastName', 'Liar')
     print(f'found: {len(liars)} persons')
+    print(f'index built in {index.build_time * 1000:.3f}ms, '
+          f'using {index.memory_usage} bytes')
     for liar in liars:
         firstname = liar.find('firstName').text
         print(f'first name: {firstname}')
@@ -77,6 +275,15 @@ def main():
         print()
     print()
 
+    json_stream = extract_data_from('data/movies.json', streaming=True)
+    count = sum(1 for _ in json_stream.records())
+    print(f'Streamed: {count} movies')
+
+    xml_stream = extract_data_from('data/person.xml', streaming=True)
+    liars = [p.find('firstName').text for p in xml_stream.records()
+             if p.find('lastName').text == 'Liar']
+    print(f'Streamed liars: {", ".join(liars)}')
+
 
 if __name__ == '__main__':
     main()
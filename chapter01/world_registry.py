@@ -0,0 +1,91 @@
+import importlib
+import time
+
+ENTRY_POINT_GROUP = 'game.worlds'
+
+
+def _split_path(path):
+    module_name, _, attr = path.partition(':')
+    if not module_name or not attr:
+        raise ValueError(f"World path {path!r} is not of the form 'module:attribute'")
+    return module_name, attr
+
+
+class WorldRegistry:
+    """Registry of world factories declared by 'module:attribute' path.
+
+    A world's module is imported only the first time the world is
+    requested, so registering a world costs the same whatever the size
+    of the module behind it. Worlds can also be declared by installed
+    packages through the 'game.worlds' entry point group.
+    """
+
+    def __init__(self, use_entry_points=True):
+        self.declared = dict()
+        self.loaded = dict()
+        self.import_times = dict()
+        self.use_entry_points = use_entry_points
+        self._entry_points_scanned = False
+
+    def register(self, name, path):
+        _split_path(path)
+        self.declared[name] = path
+        self.loaded.pop(name, None)
+
+    def _scan_entry_points(self):
+        self._entry_points_scanned = True
+        if not self.use_entry_points:
+            return
+        from importlib import metadata
+        eps = metadata.entry_points()
+        if hasattr(eps, 'select'):
+            eps = eps.select(group=ENTRY_POINT_GROUP)
+        else:
+            eps = eps.get(ENTRY_POINT_GROUP, ())
+        for ep in eps:
+            self.declared.setdefault(ep.name, ep.value)
+
+    def get(self, name):
+        try:
+            return self.loaded[name]
+        except KeyError:
+            pass
+        if name not in self.declared and not self._entry_points_scanned:
+            self._scan_entry_points()
+        try:
+            path = self.declared[name]
+        except KeyError:
+            raise ValueError(f'Unknown world: {name}') from None
+        module_name, attr = _split_path(path)
+        start = time.perf_counter()
+        factory = importlib.import_module(module_name)
+        for part in attr.split('.'):
+            factory = getattr(factory, part)
+        self.import_times[name] = time.perf_counter() - start
+        self.loaded[name] = factory
+        return factory
+
+    def names(self):
+        if not self._entry_points_scanned:
+            self._scan_entry_points()
+        return sorted(self.declared)
+
+    def import_report(self):
+        return [(name, self.import_times.get(name)) for name in sorted(self.declared)]
+
+
+worlds = WorldRegistry()
+worlds.register('frog', 'abstract_factory:FrogWorld')
+worlds.register('wizard', 'abstract_factory:WizardWorld')
+
+
+def main():
+    # only the requested worlds are imported (see abstract_factory.main)
+    worlds.get('frog')
+    for name, elapsed in worlds.import_report():
+        status = 'not loaded' if elapsed is None else f'{elapsed * 1000:.3f}ms'
+        print(f'{name}: {status}')
+
+
+if __name__ == '__main__':
+    main()
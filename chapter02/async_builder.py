@@ -0,0 +1,76 @@
+import asyncio
+import contextlib
+import io
+import time
+
+from builder import CreamyBaconBuilder, MargaritaBuilder, Waiter
+
+
+class ScaledClock:
+    """A clock running time_scale times as fast as real time."""
+
+    def __init__(self, time_scale=1.0):
+        self.time_scale = time_scale
+
+    def sleep(self, seconds):
+        time.sleep(seconds * self.time_scale)
+
+
+class AsyncClock(ScaledClock):
+    """A scaled clock whose sleep() is awaited, for the AsyncWaiter."""
+
+    async def sleep(self, seconds):
+        await asyncio.sleep(seconds * self.time_scale)
+
+
+class AsyncWaiter:
+    """A waiter who interleaves the preparation of many orders, prepared
+    by builders using an AsyncClock."""
+
+    async def construct_pizza(self, builder):
+        steps = (builder.prepare_dough,
+                 builder.add_sauce,
+                 builder.add_topping,
+                 builder.bake)
+        for step in steps:
+            for delay in step():
+                await builder.clock.sleep(delay)
+        return builder.pizza
+
+    async def serve(self, builders):
+        return await asyncio.gather(*(self.construct_pizza(b) for b in builders))
+
+
+def serial_throughput(orders, time_scale):
+    """Pizzas per minute when a single Waiter prepares the orders one by one."""
+    clock = ScaledClock(time_scale)
+    start = time.perf_counter()
+    for i in range(orders):
+        Waiter().construct_pizza((MargaritaBuilder, CreamyBaconBuilder)[i % 2](clock))
+    elapsed = time.perf_counter() - start
+    return orders * 60 / elapsed
+
+
+def async_throughput(orders, time_scale):
+    """Pizzas per minute when an AsyncWaiter prepares the orders concurrently."""
+    builders = [(MargaritaBuilder, CreamyBaconBuilder)[i % 2](AsyncClock(time_scale))
+                for i in range(orders)]
+    start = time.perf_counter()
+    asyncio.run(AsyncWaiter().serve(builders))
+    elapsed = time.perf_counter() - start
+    return orders * 60 / elapsed
+
+
+def main():
+    # run the kitchen a hundred times faster than real time
+    time_scale = 0.01
+    for orders in (1, 10, 100):
+        with contextlib.redirect_stdout(io.StringIO()):
+            serial = serial_throughput(orders, time_scale)
+            concurrent = async_throughput(orders, time_scale)
+        print(f'{orders} orders: serial {serial * time_scale:.1f} pizzas/min, '
+              f'async {concurrent * time_scale:.1f} pizzas/min (real time)')
+
+
+if __name__ == '__main__':
+    main()
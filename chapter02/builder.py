@@ -9,6 +9,10 @@ PizzaTopping = Enum('PizzaTopping',
                     'mozzarella double_mozzarella bacon ham mushrooms red_onion oregano')
 STEP_DELAY = 3 # in seconds for the sake of the example
 
+# Each step is a generator yielding the delays it waits for: the Waiter
+# sleeps them on the builder's clock, an AsyncWaiter awaits them instead
+# (see async_builder.py).
+
 
 class Pizza:
     def __init__(self, name):
@@ -23,24 +27,25 @@ class Pizza:
     def prepare_dough(self, dough):
         self.dough = dough
         print(f'preparing the {self.dough.name} dough of your {self}...')
-        time.sleep(STEP_DELAY)
+        yield STEP_DELAY
         print(f'done with the {self.dough.name} dough')
 
         
 class MargaritaBuilder:
-    def __init__(self):
+    def __init__(self, clock=time):
+        self.clock = clock
         self.pizza = Pizza('margarita')
         self.progress = PizzaProgress.queued
         self.baking_time = 5 # in seconds for the sake of the example
 
     def prepare_dough(self):
         self.progress = PizzaProgress.preparation
-        self.pizza.prepare_dough(PizzaDough.thin)
+        yield from self.pizza.prepare_dough(PizzaDough.thin)
 
     def add_sauce(self):
         print('adding the tomato sauce to your margarita...')
         self.pizza.sauce = PizzaSauce.tomato
-        time.sleep(STEP_DELAY)
+        yield STEP_DELAY
         print('done with the tomato sauce')
 
     def add_topping(self):
@@ -48,31 +53,32 @@ class MargaritaBuilder:
         topping_items = (PizzaTopping.double_mozzarella, PizzaTopping.oregano)
         print(f'adding the topping ({topping_desc}) to your margarita')
         self.pizza.topping.append([t for t in topping_items])
-        time.sleep(STEP_DELAY)
+        yield STEP_DELAY
         print(f'done with the topping ({topping_desc})')
 
     def bake(self):
         self.progress = PizzaProgress.baking
         print(f'baking your margarita for {self.baking_time} seconds')
-        time.sleep(self.baking_time)
+        yield self.baking_time
         self.progress = PizzaProgress.ready
         print('your margarita is ready')
 
         
 class CreamyBaconBuilder:
-    def __init__(self):
+    def __init__(self, clock=time):
+        self.clock = clock
         self.pizza = Pizza('creamy bacon')
         self.progress = PizzaProgress.queued
         self.baking_time = 7 # in seconds for the sake of the example
 
     def prepare_dough(self):
         self.progress = PizzaProgress.preparation
-        self.pizza.prepare_dough(PizzaDough.thick)
+        yield from self.pizza.prepare_dough(PizzaDough.thick)
 
     def add_sauce(self):
         print('adding the crème fraîche sauce to your creamy bacon')
         self.pizza.sauce = PizzaSauce.creme_fraiche
-        time.sleep(STEP_DELAY)
+        yield STEP_DELAY
         print('done with the crème fraîche sauce')
 
     def add_topping(self):
@@ -85,13 +91,13 @@ class CreamyBaconBuilder:
                           PizzaTopping.oregano)
         print(f'adding the topping ({topping_desc}) to your creamy bacon')
         self.pizza.topping.append([t for t in topping_items])
-        time.sleep(STEP_DELAY)
+        yield STEP_DELAY
         print(f'done with the topping ({topping_desc})')
 
     def bake(self):
         self.progress = PizzaProgress.baking
         print(f'baking your creamy bacon for {self.baking_time} seconds')
-        time.sleep(self.baking_time)
+        yield self.baking_time
         self.progress = PizzaProgress.ready
         print('your creamy bacon is ready')
 
@@ -106,7 +112,9 @@ class Waiter:
                  builder.add_sauce, 
                  builder.add_topping, 
                  builder.bake)
-        [step() for step in steps]
+        for step in steps:
+            for delay in step():
+                builder.clock.sleep(delay)
 
     @property
     def pizza(self):
@@ -1,7 +1,39 @@
 class Pizza: 
-    def __init__(self, builder): 
-        self.garlic = builder.garlic 
-        self.extra_cheese  = builder.extra_cheese 
+    # Pizzas are immutable and interned: building the same configuration
+    # twice returns the same object
+    __slots__ = ('garlic', 'extra_cheese')
+    _cache = dict()
+
+    def __new__(cls, builder): 
+        return cls._intern(builder.garlic, builder.extra_cheese)
+
+    @classmethod
+    def _intern(cls, garlic, extra_cheese):
+        key = (garlic, extra_cheese)
+        pizza = cls._cache.get(key)
+        if pizza is None:
+            pizza = super().__new__(cls)
+            object.__setattr__(pizza, 'garlic', garlic)
+            object.__setattr__(pizza, 'extra_cheese', extra_cheese)
+            cls._cache[key] = pizza
+        return pizza
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f'{type(self).__name__} objects are immutable')
+
+    def __delattr__(self, name):
+        raise AttributeError(f'{type(self).__name__} objects are immutable')
+
+    def __eq__(self, other):
+        if not isinstance(other, Pizza):
+            return NotImplemented
+        return (self.garlic, self.extra_cheese) == (other.garlic, other.extra_cheese)
+
+    def __hash__(self):
+        return hash((self.garlic, self.extra_cheese))
+
+    def __reduce__(self):
+        return (Pizza._intern, (self.garlic, self.extra_cheese))
  
     def __str__(self): 
         garlic = 'yes' if self.garlic else 'no' 
@@ -0,0 +1,152 @@
+import bisect
+import sys
+import threading
+import time
+import tracemalloc
+from array import array
+
+from computer_builder import Computer, HardwareEngineer
+
+SERIAL_PREFIX = 'AG'
+
+
+class Fleet:
+    """Array-backed storage for the specs of many computers.
+
+    Memory and hard disk sizes live in typed arrays and GPU models are
+    stored once, as indexes into a table of distinct names. Computer
+    objects are only created on demand.
+
+    Computers are numbered from first_serial when it is given, else they
+    take the next serials free among all such fleets, so that computers
+    of different fleets never share a serial.
+    """
+
+    _next_serial = 0
+    _serial_lock = threading.Lock()
+
+    def __init__(self, first_serial=None):
+        self.first_serial = first_serial
+        # runs of consecutive serials: index of their first computer and its serial
+        self._run_starts = array('Q')
+        self._run_serials = array('Q')
+        self.memory = array('H') # in gigabytes
+        self.hdd = array('I') # in gigabytes
+        self.gpu_ids = array('H')
+        self.gpus = []
+        self._gpu_index = dict()
+
+    def __len__(self):
+        return len(self.memory)
+
+    def serial(self, i):
+        if self.first_serial is not None:
+            number = self.first_serial + i
+        else:
+            run = bisect.bisect_right(self._run_starts, i) - 1
+            number = self._run_serials[run] + i - self._run_starts[run]
+        return f'{SERIAL_PREFIX}{number:08d}'
+
+    def _reserve_serials(self, count):
+        if self.first_serial is not None or not count:
+            return
+        with Fleet._serial_lock:
+            serial = Fleet._next_serial
+            Fleet._next_serial += count
+        start = len(self)
+        if self._run_starts and \
+                self._run_serials[-1] + start - self._run_starts[-1] == serial:
+            return # the last run goes on
+        self._run_starts.append(start)
+        self._run_serials.append(serial)
+
+    def __getitem__(self, i):
+        if not 0 <= i < len(self):
+            raise IndexError('fleet index out of range')
+        computer = Computer(self.serial(i))
+        computer.memory = self.memory[i]
+        computer.hdd = self.hdd[i]
+        computer.gpu = self.gpus[self.gpu_ids[i]]
+        return computer
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def _gpu_id(self, gpu_model):
+        gpu_id = self._gpu_index.get(gpu_model)
+        if gpu_id is None:
+            gpu_id = self._gpu_index[gpu_model] = len(self.gpus)
+            self.gpus.append(sys.intern(gpu_model))
+        return gpu_id
+
+    @property
+    def nbytes(self):
+        arrays = (self.memory, self.hdd, self.gpu_ids, self._run_starts, self._run_serials)
+        size = sum(a.itemsize * len(a) for a in arrays)
+        return size + sum(sys.getsizeof(gpu) for gpu in self.gpus)
+
+
+class FleetBuilder:
+    def __init__(self, first_serial=None):
+        self.fleet = Fleet(first_serial)
+
+    def configure(self, memory, hdd, gpu):
+        """Add one computer per item of the memory, hdd and gpu columns."""
+        if not len(memory) == len(hdd) == len(gpu):
+            raise ValueError('memory, hdd and gpu columns must have the same length')
+        fleet = self.fleet
+        # convert every column first, so that an invalid value leaves
+        # the fleet untouched
+        memory = array(fleet.memory.typecode, memory)
+        hdd = array(fleet.hdd.typecode, hdd)
+        gpu_ids = array(fleet.gpu_ids.typecode, [fleet._gpu_id(model) for model in gpu])
+        fleet._reserve_serials(len(memory))
+        fleet.memory.extend(memory)
+        fleet.hdd.extend(hdd)
+        fleet.gpu_ids.extend(gpu_ids)
+        return self
+
+
+def per_object_build(memory, hdd, gpu):
+    computers = []
+    engineer = HardwareEngineer()
+    for m, h, g in zip(memory, hdd, gpu):
+        engineer.construct_computer(memory=m, hdd=h, gpu=g)
+        computers.append(engineer.computer)
+    return computers
+
+
+def measure(build, *columns):
+    # tracing slows allocations down, so time an untraced build
+    start = time.perf_counter()
+    build(*columns)
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    try:
+        result = build(*columns)
+        size, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, elapsed, size
+
+
+def main():
+    count = 200000
+    gpu_models = ('GeForce GTX 650 Ti', 'Intel HD Graphics 5000', 'Radeon Pro 560X')
+    memory = [(4, 8, 16, 32)[i % 4] for i in range(count)]
+    hdd = [(250, 500, 1000)[i % 3] for i in range(count)]
+    gpu = [gpu_models[i % 3] for i in range(count)]
+
+    for name, build in (('per object', per_object_build),
+                        ('fleet', lambda *c: FleetBuilder().configure(*c).fleet)):
+        result, elapsed, size = measure(build, memory, hdd, gpu)
+        print(f'{name}: {count / elapsed:,.0f} computers/s, '
+              f'{size / count:.1f} bytes per computer')
+    print()
+    print(f'Serial: {result.serial(123)}')
+    print(result[123])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,47 @@
+import time
+import tracemalloc
+
+from exercise_fluent_builder import Pizza
+
+BUILDS = 1000000
+
+
+class MutablePizza:
+    """The fluent builder product before interning, for comparison."""
+
+    def __init__(self, builder):
+        self.garlic = builder.garlic
+        self.extra_cheese = builder.extra_cheese
+
+
+def build_all(product):
+    pizzas = []
+    for i in range(BUILDS):
+        builder = Pizza.PizzaBuilder()
+        if i % 2:
+            builder.add_garlic()
+        if i % 3:
+            builder.add_extra_cheese()
+        pizzas.append(product(builder))
+    return pizzas
+
+
+def main():
+    for name, product in (('mutable', MutablePizza), ('interned', Pizza)):
+        # tracing slows allocations down, so time an untraced run
+        start = time.perf_counter()
+        build_all(product)
+        elapsed = time.perf_counter() - start
+        tracemalloc.start()
+        pizzas = build_all(product)
+        size, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        distinct = len(set(map(id, pizzas)))
+        print(f'{name}: {elapsed / BUILDS * 1e9:.0f}ns per build, '
+              f'{size / 1024 / 1024:.1f}MiB for {BUILDS} pizzas '
+              f'({distinct} distinct objects)')
+        del pizzas
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,125 @@
+import heapq
+from collections import namedtuple
+
+from builder import CreamyBaconBuilder, MargaritaBuilder, STEP_DELAY
+
+# step name: (resource kind, steps it depends on)
+PIZZA_STEPS = {
+    'prepare_dough': ('station', ()),
+    'add_sauce': ('station', ('prepare_dough',)),
+    'add_topping': ('station', ('prepare_dough',)),
+    'bake': ('oven', ('add_sauce', 'add_topping')),
+}
+
+ScheduledStep = namedtuple('ScheduledStep', 'order pizza step resource start end')
+
+
+class OvenScheduler:
+    """Schedule the steps of a batch of pizza orders on a limited number
+    of preparation stations and ovens.
+
+    The steps of an order form a dependency graph (PIZZA_STEPS). Ready
+    steps are dispatched as soon as a resource of their kind is free,
+    those of orders already started first, then those with the longest
+    remaining path. This keeps the ovens, the bottleneck, busy and the
+    time until the whole batch is finished (the makespan) short.
+    """
+
+    def __init__(self, stations=2, ovens=1, steps=PIZZA_STEPS):
+        self.capacity = dict(station=stations, oven=ovens)
+        for kind, count in self.capacity.items():
+            if count < 1:
+                raise ValueError(f'At least one {kind} is needed, not {count}')
+        self.steps = steps
+
+    def _durations(self, builder):
+        return {step: builder.baking_time if step == 'bake' else STEP_DELAY
+                for step in self.steps}
+
+    def _bottom_levels(self, durations):
+        levels = dict()
+
+        def level(step):
+            if step not in levels:
+                successors = [s for s, (_, deps) in self.steps.items() if step in deps]
+                levels[step] = durations[step] + max((level(s) for s in successors), default=0)
+            return levels[step]
+
+        for step in self.steps:
+            level(step)
+        return levels
+
+    def schedule(self, builders):
+        orders = [(str(b.pizza), self._durations(b)) for b in builders]
+        levels = [self._bottom_levels(durations) for _, durations in orders]
+        remaining = [{step: len(deps) for step, (_, deps) in self.steps.items()}
+                     for _ in orders]
+        free = {kind: list(range(count)) for kind, count in self.capacity.items()}
+        ready = {kind: [] for kind in self.capacity}
+        running = []
+        started = set()
+        result = []
+
+        def make_ready(order, step):
+            kind = self.steps[step][0]
+            # finish the orders already started before starting new ones,
+            # so that the oven gets pizzas to bake as early as possible
+            heapq.heappush(ready[kind],
+                           (order not in started, -levels[order][step], order, step))
+
+        for order in range(len(orders)):
+            for step, count in remaining[order].items():
+                if count == 0:
+                    make_ready(order, step)
+
+        now = 0
+        while running or any(ready.values()):
+            for kind, queue in ready.items():
+                while queue and free[kind]:
+                    _, _, order, step = heapq.heappop(queue)
+                    resource = heapq.heappop(free[kind])
+                    started.add(order)
+                    end = now + orders[order][1][step]
+                    heapq.heappush(running, (end, order, step, kind, resource))
+                    result.append(ScheduledStep(order, orders[order][0], step,
+                                                f'{kind} {resource}', now, end))
+            now, order, step, kind, resource = heapq.heappop(running)
+            finished = [(order, step, kind, resource)]
+            while running and running[0][0] == now:
+                finished.append(heapq.heappop(running)[1:])
+            for order, step, kind, resource in finished:
+                heapq.heappush(free[kind], resource)
+                for successor, (_, deps) in self.steps.items():
+                    if step in deps:
+                        remaining[order][successor] -= 1
+                        if remaining[order][successor] == 0:
+                            make_ready(order, successor)
+        return result
+
+    def utilisation(self, schedule):
+        makespan = max((s.end for s in schedule), default=0)
+        busy = dict.fromkeys(self.capacity, 0)
+        for s in schedule:
+            busy[s.resource.split()[0]] += s.end - s.start
+        stats = {kind: busy[kind] / (count * makespan) if makespan else 0
+                 for kind, count in self.capacity.items()}
+        return makespan, stats
+
+
+def main():
+    order_mix = [MargaritaBuilder] * 3 + [CreamyBaconBuilder] * 2
+    scheduler = OvenScheduler(stations=2, ovens=1)
+    schedule = scheduler.schedule([builder() for builder in order_mix])
+    for s in sorted(schedule, key=lambda s: (s.start, s.resource)):
+        print(f'{s.start:>4}-{s.end:<4} {s.resource:<10} order {s.order} '
+              f'({s.pizza}): {s.step}')
+    makespan, stats = scheduler.utilisation(schedule)
+    serial = sum(sum(scheduler._durations(b()).values()) for b in order_mix)
+    print()
+    print(f'makespan: {makespan} seconds (serial waiter: {serial} seconds)')
+    for kind, ratio in stats.items():
+        print(f'{kind} utilisation: {ratio:.0%}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+import contextlib
+import heapq
+import random
+import statistics
+import time
+
+from builder import CreamyBaconBuilder, MargaritaBuilder, Waiter
+
+
+class VirtualClock:
+    """A clock whose sleep() advances virtual time instantly."""
+
+    def __init__(self, now=0.0):
+        self.now = now
+
+    def time(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+class NullWriter:
+    def write(self, text):
+        pass
+
+    def flush(self):
+        pass
+
+
+class PizzaSimulation:
+    """Discrete-event simulation of a pizzeria where orders arrive at
+    random and are served first come, first served by a number of waiters.
+
+    Each order is prepared by the regular Waiter and builders, driven by
+    a VirtualClock, so the builder delays cost no real time.
+    """
+
+    def __init__(self, waiters=4, arrival_rate=1 / 10, seed=None,
+                 builders=(MargaritaBuilder, CreamyBaconBuilder)):
+        self.waiters = waiters
+        self.arrival_rate = arrival_rate # orders per second
+        self.builders = builders
+        self.random = random.Random(seed)
+
+    def run(self, orders):
+        if orders < 1:
+            raise ValueError(f'Cannot simulate {orders} orders')
+        clock = VirtualClock()
+        free_at = [0.0] * self.waiters
+        arrival = 0.0
+        latencies, waits, events = [], [], []
+        with contextlib.redirect_stdout(NullWriter()):
+            for _ in range(orders):
+                arrival += self.random.expovariate(self.arrival_rate)
+                start = max(arrival, heapq.heappop(free_at))
+                clock.now = start
+                builder = self.random.choice(self.builders)(clock)
+                Waiter().construct_pizza(builder)
+                heapq.heappush(free_at, clock.now)
+                latencies.append(clock.now - arrival)
+                waits.append(start - arrival)
+                if start > arrival:
+                    events.append((arrival, 1))
+                    events.append((start, -1))
+        duration = max(free_at)
+        return self._stats(orders, duration, latencies, waits, events)
+
+    def _stats(self, orders, duration, latencies, waits, events):
+        queue_length = max_queue_length = 0
+        for _, change in sorted(events):
+            queue_length += change
+            max_queue_length = max(max_queue_length, queue_length)
+        # quantiles() needs two data points at least
+        if len(latencies) > 1:
+            percentiles = statistics.quantiles(latencies, n=100)
+        else:
+            percentiles = latencies * 99
+        return dict(orders=orders,
+                    duration=duration,
+                    mean_latency=statistics.mean(latencies),
+                    p50_latency=percentiles[49],
+                    p95_latency=percentiles[94],
+                    max_latency=max(latencies),
+                    mean_wait=statistics.mean(waits),
+                    # Little's law: mean number of orders waiting
+                    mean_queue_length=sum(waits) / duration,
+                    max_queue_length=max_queue_length)
+
+
+def main():
+    simulation = PizzaSimulation(waiters=4, arrival_rate=1 / 6, seed=42)
+    start = time.perf_counter()
+    stats = simulation.run(100000)
+    elapsed = time.perf_counter() - start
+    print(f'simulated {stats["duration"] / 3600:.1f} hours in {elapsed:.1f} seconds')
+    for name, value in stats.items():
+        print(f'{name}: {value:.2f}' if isinstance(value, float) else f'{name}: {value}')
+
+
+if __name__ == '__main__':
+    main()
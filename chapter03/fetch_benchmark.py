@@ -0,0 +1,89 @@
+import contextlib
+import io
+import statistics
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from singleton import ResponseCache, URLFetcher
+
+REQUESTS = 500
+BODY = b'x' * 1024
+ETAG = '"v1"'
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1' # keep connections alive
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        if self.headers.get('If-None-Match') == ETAG:
+            self.send_response(304)
+            self.send_header('ETag', ETAG)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain')
+        self.send_header('Content-Length', str(len(BODY)))
+        self.send_header('ETag', ETAG)
+        self.end_headers()
+        self.wfile.write(BODY)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_server():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StandInHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def report(label, elapsed, latencies):
+    p99 = statistics.quantiles(latencies, n=100)[98]
+    print(f'{label}: {len(latencies) / elapsed:,.0f} requests/s, '
+          f'p99 latency {p99 * 1000:.2f}ms')
+
+
+def fetch_many(fetcher, label, urls, workers):
+    start = time.perf_counter()
+    results = fetcher.fetch_many(urls, max_workers=workers)
+    elapsed = time.perf_counter() - start
+    errors = sum(1 for r in results if r.error is not None)
+    report(f'{label} ({workers} workers, {errors} errors)', elapsed,
+           [r.elapsed for r in results])
+
+
+def main():
+    server = start_server()
+    host, port = server.server_address
+    urls = [f'http://{host}:{port}/page/{i}' for i in range(REQUESTS)]
+    fetcher = URLFetcher()
+
+    # every full fetch run starts from an empty cache, so that none of
+    # them is answered with 304s thanks to the runs before it
+    fetcher.cache = ResponseCache()
+    latencies = []
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        for url in urls:
+            t = time.perf_counter()
+            fetcher.fetch(url)
+            latencies.append(time.perf_counter() - t)
+    report('fetch loop', time.perf_counter() - start, latencies)
+
+    for workers in (1, 4, 8):
+        fetcher.cache = ResponseCache()
+        fetch_many(fetcher, 'fetch_many', urls, workers)
+
+    # the cache now holds every page: measure revalidation on its own
+    cache = fetcher.cache
+    cache.hits = cache.misses = cache.bytes_saved = 0
+    fetch_many(fetcher, 'fetch_many revalidating', urls, 8)
+    print(f'revalidation hit ratio: {cache.hit_ratio:.0%}, '
+          f'bytes saved: {cache.bytes_saved:,}')
+    server.shutdown()
+
+if __name__ == '__main__':
+    main()
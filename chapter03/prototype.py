@@ -1,4 +1,8 @@
 import copy
+import io
+import mmap
+import pickle
+import struct
 
 class Website: 
     def __init__(self, name, domain, description, author, **kwargs): 
@@ -26,25 +30,218 @@ class Website:
         return ''.join(summary) 
 
         
+IMMUTABLE_TYPES = (str, bytes, int, float, complex, bool, type(None), range)
+SNAPSHOT_MAGIC = b'PROTOSN1'
+SNAPSHOT_ALIGNMENT = 64
+OUT_OF_BAND_MIN_SIZE = 4096 # buffers at least this big are stored out of band
+
+
+def is_immutable(value):
+    '''Tell if a value can be shared between clones without copying.'''
+    if isinstance(value, IMMUTABLE_TYPES):
+        return True
+    if isinstance(value, (tuple, frozenset)):
+        return all(is_immutable(item) for item in value)
+    if isinstance(value, memoryview):
+        return value.readonly
+    return False
+
+
+def _buffer_view(buffer):
+    return memoryview(buffer).toreadonly()
+
+
+class _OutOfBandBuffer:
+    __slots__ = ('data',)
+
+    def __init__(self, data):
+        self.data = data
+
+    def __reduce_ex__(self, protocol):
+        return (_buffer_view, (pickle.PickleBuffer(self.data),))
+
+
+def _is_big_buffer(value):
+    # bytes, and the memoryviews load() gives back for them
+    if type(value) is bytes:
+        return len(value) >= OUT_OF_BAND_MIN_SIZE
+    return (type(value) is memoryview and value.contiguous
+            and value.nbytes >= OUT_OF_BAND_MIN_SIZE)
+
+
+def _shared_buffers(obj):
+    '''A deepcopy memo sharing the read-only memoryview attributes of obj,
+       which deepcopy cannot copy.
+    '''
+    return {id(val): val for val in getattr(obj, '__dict__', {}).values()
+            if isinstance(val, memoryview) and val.readonly}
+
+
+def _wrap_buffers(state):
+    return {key: _OutOfBandBuffer(val) if _is_big_buffer(val) else val
+            for key, val in state.items()}
+
+
+class _SnapshotPickler(pickle.Pickler):
+    def reducer_override(self, obj):
+        # bytes are always pickled in band and memoryviews not at all,
+        # so send the big buffers of the state out of band through a
+        # wrapper, keeping the rest of the object's own reduction
+        if isinstance(obj, type) or not getattr(obj, '__dict__', None):
+            return NotImplemented
+        reduced = obj.__reduce_ex__(5)
+        if not isinstance(reduced, tuple) or len(reduced) < 3:
+            return NotImplemented
+        state = reduced[2]
+        if isinstance(state, dict):
+            if not any(_is_big_buffer(val) for val in state.values()):
+                return NotImplemented
+            state = _wrap_buffers(state)
+        elif isinstance(state, tuple) and len(state) == 2 and isinstance(state[0], dict):
+            # (__dict__ state, __slots__ state)
+            if not any(_is_big_buffer(val) for val in state[0].values()):
+                return NotImplemented
+            state = (_wrap_buffers(state[0]), state[1])
+        else:
+            return NotImplemented
+        return reduced[:2] + (state,) + reduced[3:]
+
+
 class Prototype: 
-    def __init__(self): 
+    def __init__(self, sharing=False): 
+        '''With sharing, clones share the immutable attributes of the
+           registered object instead of deep copying them. Registered
+           objects are then treated as frozen templates.
+        '''
         self.objects = dict() 
+        self.sharing = sharing
+        self._mutable_attrs = dict()
  
     def register(self, identifier, obj): 
         self.objects[identifier] = obj 
+        if self.sharing and hasattr(obj, '__dict__'):
+            self._mutable_attrs[identifier] = tuple(
+                key for key, val in vars(obj).items() if not is_immutable(val))
  
     def unregister(self, identifier): 
         del self.objects[identifier] 
+        self._mutable_attrs.pop(identifier, None)
  
     def clone(self, identifier, **attrs): 
         found = self.objects.get(identifier) 
         if not found: 
             raise ValueError(f'Incorrect object identifier: {identifier}') 
-        obj = copy.deepcopy(found) 
+        mutable_attrs = self._mutable_attrs.get(identifier)
+        if mutable_attrs is not None:
+            return self._shared_copy(found, mutable_attrs, attrs)
+        obj = copy.deepcopy(found, _shared_buffers(found)) 
         for key in attrs:
             setattr(obj, key, attrs[key])
 
         return obj
+
+    def clone_many(self, identifier, overrides):
+        '''Lazily clone the registered object once per set of overrides.
+
+           overrides is either an iterable of dicts, or a dict mapping
+           attribute names to columns of values, all of the same length.
+        '''
+        found = self.objects.get(identifier) 
+        if not found: 
+            raise ValueError(f'Incorrect object identifier: {identifier}') 
+        if isinstance(overrides, dict):
+            lengths = {len(values) for values in overrides.values()}
+            if len(lengths) > 1:
+                raise ValueError(f'Columns of different lengths: {sorted(lengths)}')
+            keys = tuple(overrides)
+            overrides = (dict(zip(keys, values)) for values in zip(*overrides.values()))
+        if not hasattr(found, '__dict__'):
+            return (self.clone(identifier, **attrs) for attrs in overrides)
+        mutable_attrs = self._mutable_attrs.get(identifier)
+        if mutable_attrs is None:
+            mutable_attrs = tuple(
+                key for key, val in vars(found).items() if not is_immutable(val))
+        return self._clone_rows(found, mutable_attrs, overrides)
+
+    def save(self, path):
+        '''Write the registered objects to a single snapshot file. Large
+           binary attributes are stored out of band, after the pickle.
+        '''
+        buffers = []
+        payload = io.BytesIO()
+        _SnapshotPickler(payload, protocol=5,
+                         buffer_callback=buffers.append).dump(self.objects)
+        chunks = [payload.getbuffer()] + [b.raw() for b in buffers]
+        header_size = struct.calcsize(f'<8sQ{len(chunks)}Q')
+        with open(path, 'wb') as f:
+            f.write(struct.pack(f'<8sQ{len(chunks)}Q', SNAPSHOT_MAGIC, len(chunks),
+                                *(chunk.nbytes for chunk in chunks)))
+            offset = header_size
+            for chunk in chunks:
+                padding = -offset % SNAPSHOT_ALIGNMENT
+                f.write(b'\0' * padding)
+                f.write(chunk)
+                offset += padding + chunk.nbytes
+
+    @classmethod
+    def load(cls, path):
+        '''Load a snapshot written by save().
+
+           The file is memory mapped and the large binary attributes come
+           back as read-only memoryviews over the mapping: they are not
+           copied, and processes loading the same file share their pages.
+           The returned registry clones in sharing mode. Clones share these
+           memoryviews in deepcopy mode too, and can be saved again.
+        '''
+        with open(path, 'rb') as f:
+            mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(mapping)
+        magic, count = struct.unpack_from('<8sQ', view)
+        if magic != SNAPSHOT_MAGIC:
+            raise ValueError(f'Not a prototype snapshot: {path}')
+        sizes = struct.unpack_from(f'<{count}Q', view, struct.calcsize('<8sQ'))
+        offset = struct.calcsize(f'<8sQ{count}Q')
+        chunks = []
+        for size in sizes:
+            offset += -offset % SNAPSHOT_ALIGNMENT
+            chunks.append(view[offset:offset + size])
+            offset += size
+        objects = pickle.loads(chunks[0], buffers=chunks[1:])
+        prototype = cls(sharing=True)
+        for identifier, obj in objects.items():
+            prototype.register(identifier, obj)
+        return prototype
+
+    def _clone_rows(self, found, mutable_attrs, overrides):
+        # hoist the per-template work out of the loop
+        cls = type(found)
+        new = cls.__new__
+        base = vars(found)
+        deepcopy = copy.deepcopy
+        for attrs in overrides:
+            obj = new(cls)
+            state = obj.__dict__
+            state.update(base)
+            if mutable_attrs:
+                memo = {id(found): obj}
+                for key in mutable_attrs:
+                    if key not in attrs:
+                        state[key] = deepcopy(base[key], memo)
+            state.update(attrs)
+            yield obj
+
+    def _shared_copy(self, found, mutable_attrs, attrs):
+        cls = type(found)
+        obj = cls.__new__(cls)
+        state = dict(vars(found))
+        # only copy the mutable attributes that are not overridden
+        memo = {id(found): obj}
+        for key in mutable_attrs:
+            if key not in attrs:
+                state[key] = copy.deepcopy(state[key], memo)
+        state.update(attrs)
+        obj.__dict__.update(state)
+        return obj
         
 def main(): 
     keywords = ('python', 'data', 'apis', 'automation')
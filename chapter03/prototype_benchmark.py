@@ -0,0 +1,74 @@
+import os
+import tempfile
+import time
+from timeit import Timer
+
+from prototype import Prototype, Website
+
+CLONES = 2000
+
+
+def make_site(size):
+    keywords = tuple(f'keyword{i}' for i in range(size))
+    metadata = tuple((f'key{i}', i) for i in range(size))
+    return Website('ContentGardening',
+                   domain='contentgardening.com',
+                   description='Automation and data-driven apps',
+                   author='Kamon Ayeva',
+                   category='Blog',
+                   keywords=keywords,
+                   metadata=metadata)
+
+
+def main():
+    overrides = dict(name='ContentGardeningPlayground',
+                     domain='play.contentgardening.com',
+                     description='Experimentation for techniques featured on the blog',
+                     category='Membership site',
+                     creation_date='2018-08-01')
+    print(f'{"size":>6} {"overrides":>9} {"deepcopy":>12} {"sharing":>12}')
+    for size in (10, 100, 1000):
+        site = make_site(size)
+        for nb_overrides in (0, 1, len(overrides)):
+            attrs = dict(list(overrides.items())[:nb_overrides])
+            timings = []
+            for sharing in (False, True):
+                prototype = Prototype(sharing=sharing)
+                prototype.register('ka-cg-1', site)
+                t = Timer(lambda: prototype.clone('ka-cg-1', **attrs))
+                timings.append(min(t.repeat(repeat=3, number=CLONES)) / CLONES)
+            deep, shared = (f'{t * 1e6:.2f}us' for t in timings)
+            print(f'{size:>6} {nb_overrides:>9} {deep:>12} {shared:>12}')
+
+    print()
+    site = make_site(100)
+    domains = [f'site{i}.contentgardening.com' for i in range(CLONES)]
+    names = [f'Site{i}' for i in range(CLONES)]
+    prototype = Prototype(sharing=True)
+    prototype.register('ka-cg-1', site)
+    loop = Timer(lambda: [prototype.clone('ka-cg-1', name=n, domain=d)
+                          for n, d in zip(names, domains)])
+    batch = Timer(lambda: list(prototype.clone_many('ka-cg-1',
+                                                    dict(name=names, domain=domains))))
+    for label, t in (('clone loop', loop), ('clone_many', batch)):
+        rate = CLONES / min(t.repeat(repeat=3, number=1))
+        print(f'{label}: {rate:,.0f} clones/s')
+
+    print()
+    path = os.path.join(tempfile.mkdtemp(), 'registry.snapshot')
+    for size in (10**3, 10**6, 10**8):
+        site = make_site(10)
+        site.logo = b'\x89PNG' * (size // 4)
+        prototype = Prototype()
+        prototype.register('ka-cg-1', site)
+        prototype.save(path)
+        start = time.perf_counter()
+        Prototype.load(path)
+        elapsed = time.perf_counter() - start
+        print(f'snapshot load with a {size:,} bytes payload: {elapsed * 1000:.3f}ms')
+    os.remove(path)
+    os.rmdir(os.path.dirname(path))
+
+
+if __name__ == '__main__':
+    main()
@@ -1,33 +1,366 @@
 
 
+import hashlib
+import http.client
+import os
+import pickle
+import threading
+import time
+import urllib.error
 import urllib.parse
 import urllib.request
+from collections import OrderedDict, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+MAX_WORKERS = 8
+MAX_IDLE_PER_HOST = 8
+MAX_REDIRECTS = 5
+TIMEOUT = 10 # in seconds
+MAX_CACHE_BYTES = 32 * 1024 * 1024
+MAX_DISK_CACHE_BYTES = 256 * 1024 * 1024
+MAX_REGISTRY_SIZE = 10000
+
+FetchResult = namedtuple('FetchResult', 'url status body error elapsed')
+CachedResponse = namedtuple('CachedResponse', 'body etag last_modified')
 
 
 class SingletonType(type):
+    """Thread-safe singleton metaclass.
+
+    Looking up an existing instance takes no lock; only the first
+    construction does. Classes setting reset_after_fork to True get a
+    new instance in each child process after os.fork().
+    """
     _instances = {}
+    _lock = threading.RLock()
+
     def __call__(cls, *args, **kwargs):
-        if cls not in cls._instances:
-            cls._instances[cls] = super(SingletonType, cls).__call__(*args, **kwargs)
+        try:
+            return cls._instances[cls]
+        except KeyError:
+            pass
+        with SingletonType._lock:
+            if cls not in cls._instances:
+                cls._instances[cls] = super(SingletonType, cls).__call__(*args, **kwargs)
         return cls._instances[cls]
 
+    @staticmethod
+    def _after_fork_in_child():
+        # the lock may have been held by another thread of the parent
+        SingletonType._lock = threading.RLock()
+        instances = SingletonType._instances
+        for cls in list(instances):
+            if getattr(cls, 'reset_after_fork', False):
+                del instances[cls]
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=SingletonType._after_fork_in_child)
+
+
+class ConnectionPool:
+    """Keep-alive HTTP connections, kept idle per (scheme, host)."""
+
+    def __init__(self, max_idle_per_host=MAX_IDLE_PER_HOST, timeout=TIMEOUT):
+        self.max_idle_per_host = max_idle_per_host
+        self.timeout = timeout
+        self._idle = dict()
+        self._lock = threading.Lock()
+
+    def get(self, scheme, netloc):
+        """Return a connection and whether it was reused."""
+        with self._lock:
+            idle = self._idle.get((scheme, netloc))
+            if idle:
+                return idle.pop(), True
+        if scheme == 'https':
+            return http.client.HTTPSConnection(netloc, timeout=self.timeout), False
+        if scheme == 'http':
+            return http.client.HTTPConnection(netloc, timeout=self.timeout), False
+        raise ValueError(f'Unsupported URL scheme: {scheme}')
+
+    def put(self, scheme, netloc, conn):
+        with self._lock:
+            idle = self._idle.setdefault((scheme, netloc), [])
+            if len(idle) < self.max_idle_per_host:
+                idle.append(conn)
+                return
+        conn.close()
+
+    def close(self):
+        with self._lock:
+            idle, self._idle = self._idle, dict()
+        for conns in idle.values():
+            for conn in conns:
+                conn.close()
+
+
+class ResponseCache:
+    """LRU cache of response bodies with their ETag/Last-Modified
+    validators, bounded to max_bytes in memory, with an optional disk
+    tier in directory bounded to max_disk_bytes.
+
+    The disk usage is counted when the cache is created and then kept
+    up to date by this cache only, so files written meanwhile by other
+    processes sharing the directory are not counted."""
+
+    def __init__(self, max_bytes=MAX_CACHE_BYTES, directory=None,
+                 max_disk_bytes=MAX_DISK_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.directory = directory
+        self.max_disk_bytes = max_disk_bytes
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.bytes_saved = 0
+        self.disk_evictions = 0
+        self._entries = OrderedDict()
+        # disk file path: size, least recently used first
+        self._disk_files = OrderedDict()
+        self.disk_size = 0
+        self._lock = threading.Lock()
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+            self._scan_disk()
+
+    def _scan_disk(self):
+        files = []
+        for name in os.listdir(self.directory):
+            if not name.endswith('.pickle'):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            files.append((stat.st_mtime_ns, path, stat.st_size))
+        for _, path, size in sorted(files):
+            self._disk_files[path] = size
+            self.disk_size += size
+
+    def _disk_path(self, url):
+        name = hashlib.sha1(url.encode('utf-8')).hexdigest()
+        return os.path.join(self.directory, f'{name}.pickle')
+
+    def get(self, url):
+        with self._lock:
+            entry = self._entries.get(url)
+            if entry is not None:
+                self._entries.move_to_end(url)
+                return entry
+        if self.directory is None:
+            return None
+        path = self._disk_path(url)
+        try:
+            with open(path, 'rb') as f:
+                entry = pickle.load(f)
+            # mark the entry as recently used
+            os.utime(path)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            return None
+        with self._lock:
+            if path in self._disk_files:
+                self._disk_files.move_to_end(path)
+        self._store(url, entry)
+        return entry
+
+    def conditional_headers(self, url):
+        headers = dict()
+        entry = self.get(url)
+        if entry is not None:
+            if entry.etag is not None:
+                headers['If-None-Match'] = entry.etag
+            if entry.last_modified is not None:
+                headers['If-Modified-Since'] = entry.last_modified
+        return headers
+
+    def revalidated(self, url):
+        """Return the cached body of a URL the server answered 304 for."""
+        entry = self.get(url)
+        if entry is None:
+            return None
+        with self._lock:
+            self.hits += 1
+            self.bytes_saved += len(entry.body)
+        return entry.body
+
+    def put(self, url, body, etag, last_modified):
+        with self._lock:
+            self.misses += 1
+        if etag is None and last_modified is None:
+            return
+        entry = CachedResponse(body, etag, last_modified)
+        self._store(url, entry)
+        if self.directory is not None:
+            path = self._disk_path(url)
+            with open(f'{path}.{os.getpid()}.{threading.get_ident()}.tmp', 'wb') as f:
+                pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+                size = f.tell()
+            os.replace(f.name, path)
+            self._add_to_disk(path, size)
+
+    def _store(self, url, entry):
+        if len(entry.body) > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(url, None)
+            if old is not None:
+                self.size -= len(old.body)
+            self._entries[url] = entry
+            self.size += len(entry.body)
+            while self.size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.size -= len(evicted.body)
+
+    def _add_to_disk(self, path, size):
+        evicted = []
+        with self._lock:
+            self.disk_size += size - self._disk_files.pop(path, 0)
+            self._disk_files[path] = size
+            while self.disk_size > self.max_disk_bytes:
+                old_path, old_size = self._disk_files.popitem(last=False)
+                self.disk_size -= old_size
+                self.disk_evictions += 1
+                evicted.append(old_path)
+        for old_path in evicted:
+            try:
+                os.remove(old_path)
+            except FileNotFoundError:
+                pass
+
+    @property
+    def hit_ratio(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class URLRegistry:
+    """Deduplicated registry of the most recently fetched URLs."""
+
+    def __init__(self, max_size=MAX_REGISTRY_SIZE):
+        self.max_size = max_size
+        self._urls = OrderedDict()
+        self._lock = threading.Lock()
+
+    def add(self, url):
+        with self._lock:
+            self._urls[url] = None
+            self._urls.move_to_end(url)
+            if len(self._urls) > self.max_size:
+                self._urls.popitem(last=False)
+
+    def __contains__(self, url):
+        return url in self._urls
+
+    def __len__(self):
+        return len(self._urls)
+
+    def __iter__(self):
+        with self._lock:
+            return iter(list(self._urls))
+
 
 class URLFetcher(metaclass=SingletonType):
+    # pooled connections must not be shared with a forked child
+    reset_after_fork = True
 
     def __init__(self):
-        self.urls = []
+        self.urls = URLRegistry()
+        self.pool = ConnectionPool()
+        self.cache = ResponseCache()
     
     def fetch(self, url):
-        req = urllib.request.Request(url)
-        with urllib.request.urlopen(req) as response:
+        req = urllib.request.Request(url, headers=self.cache.conditional_headers(url))
+        try:
+            response = urllib.request.urlopen(req)
+        except urllib.error.HTTPError as e:
+            if e.code != 304:
+                raise
+            the_page = self.cache.revalidated(url)
+            if the_page is not None:
+                print(the_page)
+                self.urls.add(url)
+                return
+            # evicted since its validators were sent, fetch it again
+            response = urllib.request.urlopen(url)
+        with response:
             if response.code == 200:
                 the_page = response.read()
                 print(the_page)
+                self.cache.put(url, the_page, response.headers.get('ETag'),
+                               response.headers.get('Last-Modified'))
         
-                urls = self.urls
-                urls.append(url)
-                self.urls = urls
+                self.urls.add(url)
             
+    def _request(self, url, conditional=True):
+        parts = urllib.parse.urlsplit(url)
+        path = parts.path or '/'
+        if parts.query:
+            path = f'{path}?{parts.query}'
+        headers = self.cache.conditional_headers(url) if conditional else {}
+        conn, reused = self.pool.get(parts.scheme, parts.netloc)
+        try:
+            conn.request('GET', path, headers=headers)
+            response = conn.getresponse()
+            body = response.read()
+        except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+            conn.close()
+            if not reused:
+                raise
+            # the server closed the idle connection, retry on a new one
+            conn, _ = self.pool.get(parts.scheme, parts.netloc)
+            try:
+                conn.request('GET', path, headers=headers)
+                response = conn.getresponse()
+                body = response.read()
+            except BaseException:
+                conn.close()
+                raise
+        except BaseException:
+            conn.close()
+            raise
+        if response.will_close:
+            conn.close()
+        else:
+            self.pool.put(parts.scheme, parts.netloc, conn)
+        return response, body
+
+    def _fetch_pooled(self, url):
+        start = time.perf_counter()
+        try:
+            location = url
+            for _ in range(MAX_REDIRECTS + 1):
+                response, body = self._request(location)
+                if response.status not in (301, 302, 303, 307, 308):
+                    break
+                location = urllib.parse.urljoin(location, response.getheader('Location'))
+            status = response.status
+            if status == 304:
+                cached = self.cache.revalidated(location)
+                if cached is not None:
+                    status, body = 200, cached
+                else:
+                    # evicted since its validators were sent, fetch it again
+                    response, body = self._request(location, conditional=False)
+                    status = response.status
+            if response.status == 200:
+                self.cache.put(location, body, response.getheader('ETag'),
+                               response.getheader('Last-Modified'))
+            if status == 200:
+                self.urls.add(url)
+            return FetchResult(url, status, body, None, time.perf_counter() - start)
+        except Exception as e:
+            return FetchResult(url, None, None, e, time.perf_counter() - start)
+
+    def fetch_many(self, urls, max_workers=MAX_WORKERS):
+        """Fetch the URLs concurrently over pooled keep-alive connections.
+
+        Return one FetchResult per URL, in the order of urls; a failed
+        fetch has its exception in the error field.
+        """
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(self._fetch_pooled, urls))
+
     def dump_url_registry(self):
         return ', '.join(self.urls)
 
@@ -0,0 +1,55 @@
+import os
+import threading
+from timeit import Timer
+
+from singleton import SingletonType, URLFetcher
+
+
+class UnsafeSingletonType(type):
+    """The check-then-set singleton metaclass, for comparison."""
+    _instances = {}
+    def __call__(cls, *args, **kwargs):
+        if cls not in cls._instances:
+            cls._instances[cls] = super(UnsafeSingletonType, cls).__call__(*args, **kwargs)
+        return cls._instances[cls]
+
+
+class UnsafeFetcher(metaclass=UnsafeSingletonType):
+    pass
+
+
+class SlowInit(metaclass=SingletonType):
+    constructions = 0
+
+    def __init__(self):
+        # widen the window between the check and the set
+        threading.Event().wait(0.01)
+        SlowInit.constructions += 1
+
+
+def main():
+    number = 1000000
+    for label, cls in (('check-then-set', UnsafeFetcher), ('thread-safe', URLFetcher)):
+        cls()
+        t = Timer(cls)
+        best = min(t.repeat(repeat=5, number=number)) / number
+        print(f'{label} lookup: {best * 1e9:.1f}ns')
+
+    threads = [threading.Thread(target=SlowInit) for _ in range(32)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    print(f'constructions under 32 threads: {SlowInit.constructions}')
+
+    if hasattr(os, 'fork'):
+        parent = URLFetcher()
+        pid = os.fork()
+        if pid == 0:
+            print(f'new instance in the forked child: {URLFetcher() is not parent}')
+            os._exit(0)
+        os.waitpid(pid, 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,4 +1,6 @@
 
+import operator
+
 from external import Musician, Dancer
 
  
@@ -21,6 +23,51 @@ class Adapter:
     def __str__(self): 
         return str(self.obj) 
 
+
+_adapter_classes = dict()
+
+
+def _adapter_init(self, obj):
+    self.obj = obj
+
+
+def adapter_class(adaptee_type, method_mapping):
+    '''Return the adapter class for adaptee_type, generated once per
+       (adaptee type, method mapping). method_mapping maps the names of
+       the target interface to the names of the adaptee methods.
+    '''
+    key = (adaptee_type, frozenset(method_mapping.items()))
+    cls = _adapter_classes.get(key)
+    if cls is None:
+        namespace = dict(__slots__=('obj',),
+                         __init__=_adapter_init,
+                         __str__=Adapter.__str__)
+        for target, source in method_mapping.items():
+            # looking the target up returns the bound method of the adaptee
+            namespace[target] = property(operator.attrgetter(f'obj.{source}'))
+        cls = type(f'{adaptee_type.__name__}Adapter', (), namespace)
+        _adapter_classes[key] = cls
+    return cls
+
+
+def adapt_all(objects, target, candidates):
+    '''Adapt the objects lacking the target method, using the first of
+       the candidate methods they have. The choice is made once per type.
+    '''
+    choices = dict()
+    for obj in objects:
+        obj_type = type(obj)
+        cls = choices.get(obj_type, False)
+        if cls is False:
+            cls = None
+            if not hasattr(obj_type, target):
+                for source in candidates:
+                    if hasattr(obj_type, source):
+                        cls = adapter_class(obj_type, {target: source})
+                        break
+            choices[obj_type] = cls
+        yield obj if cls is None else cls(obj)
+
         
 def main(): 
 
@@ -38,6 +85,10 @@ def main():
             
         print(f'{obj} {obj.organize_event()}') 
 
+    print()
+    for obj in adapt_all(objects, 'organize_event', ('play', 'dance')):
+        print(f'{obj} {obj.organize_event()}') 
+
   
 if __name__ == "__main__": 
     main()
\ No newline at end of file
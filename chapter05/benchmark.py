@@ -0,0 +1,143 @@
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+from collections import namedtuple
+
+MIN_TIME = 0.2 # in seconds, minimal duration of one measurement
+REPEAT = 7
+WARMUP = 1
+THRESHOLD = 0.05 # relative slow down considered a regression
+
+BenchmarkResult = namedtuple('BenchmarkResult', 'name loops median p5 p95 stdev timings')
+
+
+def calibrate(func, min_time=MIN_TIME, timer=time.perf_counter):
+    '''Returns the number of loops for func to run at least min_time'''
+    loops = 1
+    while True:
+        start = timer()
+        for _ in range(loops):
+            func()
+        elapsed = timer() - start
+        if elapsed >= min_time:
+            return loops
+        loops *= 10 if elapsed < min_time / 10 else 2
+
+
+def run_benchmark(name, func, repeat=REPEAT, warmup=WARMUP, min_time=MIN_TIME,
+                  timer=time.perf_counter):
+    '''Times func, returning the seconds per call of each measurement'''
+    loops = calibrate(func, min_time, timer)
+    timings = []
+    for i in range(warmup + repeat):
+        start = timer()
+        for _ in range(loops):
+            func()
+        elapsed = (timer() - start) / loops
+        if i >= warmup:
+            timings.append(elapsed)
+    if len(timings) > 1:
+        quantiles = statistics.quantiles(timings, n=20, method='inclusive')
+        p5, p95, stdev = quantiles[0], quantiles[-1], statistics.stdev(timings)
+    else:
+        # a single measurement has no spread
+        p5 = p95 = timings[0]
+        stdev = 0.0
+    return BenchmarkResult(name, loops, statistics.median(timings),
+                           p5, p95, stdev, timings)
+
+
+class BenchmarkSuite:
+    def __init__(self, name):
+        self.name = name
+        self.benchmarks = []
+
+    def add(self, name, func):
+        self.benchmarks.append((name, func))
+
+    def run(self, **options):
+        return {name: run_benchmark(name, func, **options)
+                for name, func in self.benchmarks}
+
+
+def save_results(results, path):
+    data = dict(python=sys.version, platform=platform.platform(),
+                results={name: r._asdict() for name, r in results.items()})
+    with open(path, 'w') as f:
+        json.dump(data, f, indent=2)
+
+
+def load_results(path):
+    with open(path) as f:
+        data = json.load(f)
+    return {name: BenchmarkResult(**r) for name, r in data['results'].items()}
+
+
+def compare_results(baseline, current, threshold=THRESHOLD):
+    '''Returns (name, ratio, verdict) for the benchmarks in both sets,
+       ratio being current median / baseline median. A benchmark is only
+       slower or faster when its median moved by more than threshold and
+       its p5-p95 range does not overlap the baseline one'''
+    comparison = []
+    for name, result in current.items():
+        if name not in baseline:
+            continue
+        base = baseline[name]
+        ratio = result.median / base.median
+        if ratio > 1 + threshold and result.p5 > base.p95:
+            verdict = 'slower'
+        elif ratio < 1 - threshold and result.p95 < base.p5:
+            verdict = 'faster'
+        else:
+            verdict = 'same'
+        comparison.append((name, ratio, verdict))
+    return comparison
+
+
+def format_result(result):
+    return (f'{result.name}: median {result.median * 1e6:.3f}us '
+            f'(p5 {result.p5 * 1e6:.3f}us, p95 {result.p95 * 1e6:.3f}us, '
+            f'stdev {result.stdev * 1e6:.3f}us, {result.loops} loops)')
+
+
+def number_sum_suite(n=300):
+    import mymath
+    import number_sum
+    import number_sum_naive
+
+    suite = BenchmarkSuite('number_sum')
+    suite.add('naive number_sum', lambda: number_sum_naive.number_sum(n))
+    suite.add('dict-cached number_sum', lambda: number_sum.number_sum(n))
+    suite.add('memoized number_sum', lambda: mymath.number_sum(n))
+    suite.add('memoized fibonacci', lambda: mymath.fibonacci(n))
+    return suite
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run the number_sum benchmark suite')
+    parser.add_argument('--output', help='write the results to this JSON file')
+    parser.add_argument('--compare', help='compare with the results of this JSON file')
+    parser.add_argument('--threshold', type=float, default=THRESHOLD)
+    args = parser.parse_args()
+
+    results = number_sum_suite().run()
+    for result in results.values():
+        print(format_result(result))
+    if args.output:
+        save_results(results, args.output)
+    if args.compare:
+        print()
+        regressions = 0
+        for name, ratio, verdict in compare_results(load_results(args.compare),
+                                                    results, args.threshold):
+            print(f'{name}: x{ratio:.2f} {verdict}')
+            regressions += verdict == 'slower'
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
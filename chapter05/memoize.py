@@ -0,0 +1,385 @@
+import asyncio
+import functools
+import hashlib
+import inspect
+import os
+import pickle
+import sqlite3
+import struct
+import sys
+import threading
+import time
+from collections import OrderedDict, namedtuple
+
+CacheInfo = namedtuple('CacheInfo', 'hits misses evictions maxsize currsize bytes')
+
+_KWARGS_MARK = object()
+_MISSING = object()
+
+
+class _Entry:
+    __slots__ = ('value', 'expires', 'size', 'freq')
+
+    def __init__(self, value, expires, size):
+        self.value = value
+        self.expires = expires
+        self.size = size
+        self.freq = 1
+
+
+class BoundedCache:
+    """Thread-safe cache evicting by LRU or LFU policy once it holds more
+    than maxsize entries or max_bytes bytes (as measured by
+    sys.getsizeof), with entries optionally expiring after ttl seconds.
+    """
+
+    def __init__(self, maxsize=None, policy='lru', ttl=None, max_bytes=None,
+                 timer=time.monotonic):
+        if policy not in ('lru', 'lfu'):
+            raise ValueError(f'Unknown eviction policy: {policy}')
+        self.maxsize = maxsize
+        self.policy = policy
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.timer = timer
+        # an unbounded cache never evicts, so skip the usage bookkeeping
+        self._bounded = maxsize is not None or max_bytes is not None
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self._entries = OrderedDict()
+        # LFU bookkeeping: keys per frequency, in insertion order
+        self._freqs = dict()
+        self._min_freq = 0
+        self.hits = self.misses = self.evictions = 0
+        self.bytes = 0
+
+    def clear(self):
+        with self._lock:
+            self._reset()
+
+    def _remove(self, key):
+        entry = self._entries.pop(key)
+        self.bytes -= entry.size
+        if self.policy == 'lfu':
+            keys = self._freqs[entry.freq]
+            del keys[key]
+            if not keys:
+                del self._freqs[entry.freq]
+
+    def _touch(self, key, entry):
+        if self.policy == 'lru':
+            self._entries.move_to_end(key)
+            return
+        keys = self._freqs[entry.freq]
+        del keys[key]
+        if not keys:
+            del self._freqs[entry.freq]
+            if self._min_freq == entry.freq:
+                self._min_freq += 1
+        entry.freq += 1
+        self._freqs.setdefault(entry.freq, OrderedDict())[key] = None
+
+    def _evict_one(self):
+        if self.policy == 'lru':
+            key = next(iter(self._entries))
+        else:
+            if self._min_freq not in self._freqs:
+                self._min_freq = min(self._freqs)
+            key = next(iter(self._freqs[self._min_freq]))
+        self._remove(key)
+        self.evictions += 1
+
+    def get(self, key, default=None):
+        if not self._bounded and self.ttl is None:
+            # reading a dict is atomic, so hits on an unbounded cache
+            # take no lock (the hit counter is then best effort)
+            entry = self._entries.get(key)
+            if entry is not None:
+                self.hits += 1
+                return entry.value
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            if entry.expires is not None and self.timer() >= entry.expires:
+                self._remove(key)
+                self.evictions += 1
+                self.misses += 1
+                return default
+            self.hits += 1
+            if self._bounded:
+                self._touch(key, entry)
+            return entry.value
+
+    def _purge_expired(self, now):
+        # entries expire in insertion order, which is the order of
+        # _entries unless LRU moves the used ones to the end; these are
+        # then bounded by maxsize or max_bytes anyway
+        entries = self._entries
+        while entries:
+            key, entry = next(iter(entries.items()))
+            if now < entry.expires:
+                break
+            self._remove(key)
+            self.evictions += 1
+
+    def put(self, key, value):
+        now = self.timer() if self.ttl is not None else None
+        expires = now + self.ttl if self.ttl is not None else None
+        size = sys.getsizeof(value) if self.max_bytes is not None else 0
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            if self.ttl is not None:
+                # do not keep the expired entries no one asks for again
+                self._purge_expired(now)
+            if self.maxsize == 0 or (self.max_bytes is not None and size > self.max_bytes):
+                # would not fit even in an empty cache
+                return value
+            # make room before inserting, so the new key is never the one
+            # evicted (under LFU it would have the lowest frequency)
+            while (self.maxsize is not None and len(self._entries) >= self.maxsize) \
+                    or (self.max_bytes is not None and self.bytes + size > self.max_bytes):
+                self._evict_one()
+            self._entries[key] = _Entry(value, expires, size)
+            self.bytes += size
+            if self.policy == 'lfu':
+                self._freqs.setdefault(1, OrderedDict())[key] = None
+                self._min_freq = 1
+            return value
+
+    def info(self):
+        with self._lock:
+            return CacheInfo(self.hits, self.misses, self.evictions,
+                             self.maxsize, len(self._entries), self.bytes)
+
+
+class DictCache:
+    """Unbounded cache without expiry: a plain dict of values, which
+    memoize reads directly on a hit.
+    """
+
+    def __init__(self):
+        self.values = dict()
+        self.hits = self.misses = 0
+
+    def clear(self):
+        self.values.clear()
+        self.hits = self.misses = 0
+
+    def info(self):
+        return CacheInfo(self.hits, self.misses, 0, None, len(self.values), 0)
+
+
+def serialize_key(obj):
+    '''Serialise a key to bytes, identically in every process and run.
+       Sets and dicts are ordered by the serialisation of their items.
+    '''
+    if obj is None or isinstance(obj, bool):
+        return repr(obj).encode('ascii')
+    if isinstance(obj, int):
+        return b'i' + str(obj).encode('ascii') + b';'
+    if isinstance(obj, float):
+        return b'f' + struct.pack('<d', obj)
+    if isinstance(obj, str):
+        data = obj.encode('utf-8')
+        return b's' + str(len(data)).encode('ascii') + b':' + data
+    if isinstance(obj, bytes):
+        return b'b' + str(len(obj)).encode('ascii') + b':' + obj
+    if isinstance(obj, (tuple, list)):
+        tag = b't' if isinstance(obj, tuple) else b'l'
+        return tag + b''.join(serialize_key(item) for item in obj) + b')'
+    if isinstance(obj, (set, frozenset)):
+        return b'S' + b''.join(sorted(serialize_key(item) for item in obj)) + b')'
+    if isinstance(obj, dict):
+        items = sorted(serialize_key(k) + serialize_key(v) for k, v in obj.items())
+        return b'd' + b''.join(items) + b')'
+    raise TypeError(f'Cannot serialise a key of type {type(obj).__name__}')
+
+
+class SQLiteBackend:
+    """Memoization store shared by all the processes using the same
+    SQLite file. Keys are hashed from their deterministic serialisation
+    and values are pickled."""
+
+    def __init__(self, path, timeout=30):
+        self.path = path
+        self.timeout = timeout
+        self.hits = self.misses = 0
+        self._local = threading.local()
+        conn = self._connection()
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('CREATE TABLE IF NOT EXISTS memo '
+                     '(key BLOB PRIMARY KEY, value BLOB NOT NULL)')
+        conn.commit()
+
+    def _connection(self):
+        # one connection per thread, and a new one after a fork
+        local = self._local
+        if getattr(local, 'pid', None) != os.getpid():
+            local.conn = sqlite3.connect(self.path, timeout=self.timeout,
+                                         isolation_level=None)
+            local.conn.execute('PRAGMA synchronous=NORMAL')
+            local.pid = os.getpid()
+        return local.conn
+
+    @staticmethod
+    def _hash(key):
+        return hashlib.sha256(serialize_key(key)).digest()
+
+    def get(self, key, default=None):
+        row = self._connection().execute('SELECT value FROM memo WHERE key = ?',
+                                         (self._hash(key),)).fetchone()
+        if row is None:
+            self.misses += 1
+            return default
+        self.hits += 1
+        return pickle.loads(row[0])
+
+    def put(self, key, value):
+        self._connection().execute('INSERT OR IGNORE INTO memo VALUES (?, ?)',
+                                   (self._hash(key),
+                                    pickle.dumps(value, pickle.HIGHEST_PROTOCOL)))
+        return value
+
+    def clear(self):
+        self._connection().execute('DELETE FROM memo')
+
+    def info(self):
+        count, size = self._connection().execute(
+            'SELECT count(*), coalesce(sum(length(value)), 0) FROM memo').fetchone()
+        return CacheInfo(self.hits, self.misses, 0, None, count, size)
+
+
+def _make_key(args, kwargs):
+    if kwargs:
+        return args + (_KWARGS_MARK,) + tuple(sorted(kwargs.items()))
+    return args
+
+
+def memoize(fn=None, *, maxsize=None, policy='lru', ttl=None, max_bytes=None,
+            backend=None):
+    '''Cache the results of fn, optionally bounded (see BoundedCache).
+
+    Used bare (@memoize) the cache is unbounded. With a backend such as
+    SQLiteBackend, results missing from the in-process cache are looked
+    up in, and added to, the backend store, unless the backend cannot
+    serialise the arguments or pickle the result. The wrapper exposes
+    cache_info() and cache_clear() for the in-process cache, and backend.
+    '''
+    if fn is None:
+        return functools.partial(memoize, maxsize=maxsize, policy=policy,
+                                 ttl=ttl, max_bytes=max_bytes, backend=backend)
+    if inspect.iscoroutinefunction(fn):
+        if backend is not None:
+            raise ValueError('A backend cannot be used with a coroutine function')
+        return async_memoize(fn, maxsize=maxsize, policy=policy, ttl=ttl,
+                             max_bytes=max_bytes)
+    name = f'{fn.__module__}.{fn.__qualname__}'
+
+    def compute(args, kwargs):
+        if backend is None:
+            return fn(*args, **kwargs)
+        backend_key = (name, args, kwargs)
+        try:
+            value = backend.get(backend_key, _MISSING)
+        except TypeError:
+            # arguments the backend cannot serialise are only cached here
+            return fn(*args, **kwargs)
+        if value is _MISSING:
+            value = fn(*args, **kwargs)
+            try:
+                backend.put(backend_key, value)
+            except (TypeError, AttributeError, pickle.PicklingError):
+                # nor can it store an unpicklable result
+                pass
+        return value
+
+    if maxsize is None and max_bytes is None and ttl is None:
+        # nothing to bound nor expire: hits are a single dict lookup
+        cache = DictCache()
+        values = cache.values
+
+        @functools.wraps(fn)
+        def memoizer(*args, **kwargs):
+            key = _make_key(args, kwargs) if kwargs else args
+            try:
+                value = values[key]
+            except KeyError:
+                cache.misses += 1
+                value = values[key] = compute(args, kwargs)
+                return value
+            cache.hits += 1
+            return value
+    else:
+        cache = BoundedCache(maxsize, policy, ttl, max_bytes)
+
+        @functools.wraps(fn)
+        def memoizer(*args, **kwargs):
+            key = _make_key(args, kwargs)
+            value = cache.get(key, _MISSING)
+            if value is not _MISSING:
+                return value
+            return cache.put(key, compute(args, kwargs))
+
+    memoizer.cache_info = cache.info
+    memoizer.cache_clear = cache.clear
+    memoizer.backend = backend
+    return memoizer
+
+
+def async_memoize(fn=None, *, maxsize=None, policy='lru', ttl=None, max_bytes=None):
+    '''Cache the awaited results of the coroutine function fn.
+
+    Concurrent calls with the same arguments share a single computation.
+    A caller being cancelled does not cancel it for the others; it is
+    only cancelled once all its callers are. Exceptions are passed to
+    every waiting caller but not cached. The wrapper exposes
+    cache_info(), cache_clear() and in_flight().
+    '''
+    if fn is None:
+        return functools.partial(async_memoize, maxsize=maxsize, policy=policy,
+                                 ttl=ttl, max_bytes=max_bytes)
+    cache = BoundedCache(maxsize, policy, ttl, max_bytes)
+    # key: [task computing the result, number of callers waiting for it]
+    in_flight = dict()
+
+    def done(key, task):
+        # a cancelled flight may already have been replaced by a new one
+        if in_flight.get(key, (None,))[0] is task:
+            del in_flight[key]
+        if not task.cancelled() and task.exception() is None:
+            cache.put(key, task.result())
+
+    @functools.wraps(fn)
+    async def memoizer(*args, **kwargs):
+        key = _make_key(args, kwargs)
+        value = cache.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+        flight = in_flight.get(key)
+        if flight is None:
+            task = asyncio.ensure_future(fn(*args, **kwargs))
+            flight = in_flight[key] = [task, 0]
+            task.add_done_callback(functools.partial(done, key))
+        task = flight[0]
+        flight[1] += 1
+        try:
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if not task.done() and flight[1] == 1:
+                # forget it now, so that a new call does not join it
+                if in_flight.get(key) is flight:
+                    del in_flight[key]
+                task.cancel()
+            raise
+        finally:
+            flight[1] -= 1
+
+    memoizer.cache_info = cache.info
+    memoizer.cache_clear = cache.clear
+    memoizer.in_flight = lambda: len(in_flight)
+    return memoizer
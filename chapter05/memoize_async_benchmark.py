@@ -0,0 +1,49 @@
+import asyncio
+import time
+
+from memoize import async_memoize
+
+TASKS = 1000
+
+
+def make_fetch():
+    calls = [0]
+
+    async def fetch(n):
+        calls[0] += 1
+        await asyncio.sleep(0.05)
+        return n * n
+
+    return fetch, calls
+
+
+def naive_async_memoize(fn):
+    '''Caches the awaited results, without coalescing the misses.'''
+    cache = dict()
+
+    async def memoizer(*args):
+        if args not in cache:
+            cache[args] = await fn(*args)
+        return cache[args]
+
+    return memoizer
+
+
+async def stampede(fn):
+    start = time.perf_counter()
+    results = await asyncio.gather(*(fn(42) for _ in range(TASKS)))
+    assert all(r == 42 * 42 for r in results)
+    return time.perf_counter() - start
+
+
+def main():
+    for label, decorator in (('naive async cache', naive_async_memoize),
+                             ('single-flight async_memoize', async_memoize)):
+        fetch, calls = make_fetch()
+        elapsed = asyncio.run(stampede(decorator(fetch)))
+        print(f'{label}: {calls[0]} computations for {TASKS} concurrent misses '
+              f'({TASKS - calls[0]} avoided) in {elapsed * 1000:.1f}ms')
+
+
+if __name__ == '__main__':
+    main()
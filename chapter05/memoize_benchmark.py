@@ -0,0 +1,61 @@
+import functools
+from timeit import Timer
+
+from memoize import BoundedCache, memoize
+
+
+def dict_memoize(fn):
+    '''The original unbounded memoize, for comparison.'''
+    cache = dict()
+
+    @functools.wraps(fn)
+    def memoizer(*args):
+        if args not in cache:
+            cache[args] = fn(*args)
+        return cache[args]
+
+    return memoizer
+
+
+def square(n):
+    return n * n
+
+
+def check_admission():
+    '''A new key is cached even once the cache is full of more used keys.'''
+    for policy in ('lru', 'lfu'):
+        cache = BoundedCache(maxsize=2, policy=policy)
+        for key in 'abc':
+            cache.put(key, key)
+            cache.get(key)
+        assert cache.get('c') == 'c', f'{policy} evicted the new key'
+        assert cache.info().evictions == 1
+
+
+def main():
+    check_admission()
+    number = 200000
+    keys = list(range(1000))
+    variants = [
+        ('dict memoize', dict_memoize(square)),
+        ('functools.lru_cache', functools.lru_cache(maxsize=None)(square)),
+        ('memoize', memoize(square)),
+        ('memoize lru', memoize(maxsize=2048)(square)),
+        ('memoize lfu', memoize(maxsize=2048, policy='lfu')(square)),
+        # half the keys fit, so these two keep evicting
+        ('memoize lru (evicting)', memoize(maxsize=500)(square)),
+        ('memoize lfu (evicting)', memoize(maxsize=500, policy='lfu')(square)),
+        ('memoize ttl', memoize(ttl=60)(square)),
+        ('memoize max_bytes', memoize(max_bytes=64 * 1024)(square)),
+    ]
+    for label, fn in variants:
+        calls = [keys[i % len(keys)] for i in range(number)]
+        t = Timer(lambda: [fn(n) for n in calls])
+        best = min(t.repeat(repeat=3, number=1)) / number
+        info = fn.cache_info() if hasattr(fn, 'cache_info') else None
+        hit_ratio = f', hit ratio {info.hits / (info.hits + info.misses):.0%}' if info else ''
+        print(f'{label}: {best * 1e9:.0f}ns per call{hit_ratio}')
+
+
+if __name__ == '__main__':
+    main()
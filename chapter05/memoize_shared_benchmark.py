@@ -0,0 +1,57 @@
+import os
+import tempfile
+import time
+from multiprocessing import Pool
+from timeit import Timer
+
+from memoize import SQLiteBackend, memoize
+
+WORKERS = 4
+KEYS = list(range(200))
+
+
+def expensive(n):
+    return sum(i * i for i in range(20000 + n * 100))
+
+
+def run_worker(db_path):
+    backend = SQLiteBackend(db_path) if db_path else None
+    fn = memoize(backend=backend)(expensive)
+    start = time.perf_counter()
+    for n in KEYS:
+        fn(n)
+    return time.perf_counter() - start
+
+
+def main():
+    with tempfile.TemporaryDirectory() as directory:
+        benchmark(os.path.join(directory, 'memo.sqlite3'))
+
+
+def benchmark(db_path):
+    for label, path in (('in-process dict', None), ('shared SQLite', db_path)):
+        start = time.perf_counter()
+        with Pool(WORKERS) as pool:
+            times = pool.map(run_worker, [path] * WORKERS)
+        elapsed = time.perf_counter() - start
+        print(f'{label}: {WORKERS} workers in {elapsed:.2f}s '
+              f'(slowest worker {max(times):.2f}s)')
+
+    # a warm store: a new process only reads results
+    with Pool(1) as pool:
+        warm, = pool.map(run_worker, [db_path])
+    print(f'warm shared SQLite worker: {warm:.3f}s')
+
+    number = 20000
+    local = memoize(expensive)
+    local(1)
+    backend = SQLiteBackend(db_path)
+    key = (f'{expensive.__module__}.{expensive.__qualname__}', (1,), {})
+    for label, stmt in (('in-process dict hit', lambda: local(1)),
+                        ('SQLite backend hit', lambda: backend.get(key))):
+        best = min(Timer(stmt).repeat(repeat=3, number=number)) / number
+        print(f'{label}: {best * 1e6:.2f}us')
+
+
+if __name__ == '__main__':
+    main()
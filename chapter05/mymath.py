@@ -1,50 +1,64 @@
 
-import functools 
- 
-def memoize(fn): 
-    cache = dict() 
- 
-    @functools.wraps(fn) 
-    def memoizer(*args): 
-        if args not in cache: 
-            cache[args] = fn(*args) 
-        return cache[args] 
- 
-    return memoizer
+from memoize import memoize
     
+# Fibonacci numbers up to the largest one that fits in a signed 64-bit word
+FIBONACCI_TABLE = [0, 1]
+while FIBONACCI_TABLE[-1] + FIBONACCI_TABLE[-2] < 2**63:
+    FIBONACCI_TABLE.append(FIBONACCI_TABLE[-1] + FIBONACCI_TABLE[-2])
+FIBONACCI_TABLE = tuple(FIBONACCI_TABLE)
+
+
 @memoize 
 def number_sum(n): 
     '''Returns the sum of the first n numbers''' 
     assert(n >= 0), 'n must be >= 0' 
-    if n == 0:
-        return 0
-    else:
-        return n + number_sum(n-1)
+    return n * (n + 1) // 2
  
 @memoize 
 def fibonacci(n): 
     '''Returns the suite of Fibonacci numbers''' 
     assert(n >= 0), 'n must be >= 0'
-    if n in (0, 1):
-        return n
-    else:
-        return fibonacci(n-1) + fibonacci(n-2)    
+    return _fast_doubling(n)
+
+def _fast_doubling(n):
+    # F(2k) = F(k) * (2F(k+1) - F(k)), F(2k+1) = F(k)^2 + F(k+1)^2,
+    # walking the bits of n from the most significant one
+    a, b = 0, 1
+    for bit in bin(n)[2:]:
+        c = a * (2 * b - a)
+        d = a * a + b * b
+        if bit == '1':
+            a, b = d, c + d
+        else:
+            a, b = c, d
+    return a
+
+def number_sum_many(ns):
+    '''Returns the sums of the first n numbers for each n of ns'''
+    ns = list(ns)
+    assert(all(n >= 0 for n in ns)), 'n must be >= 0'
+    return [n * (n + 1) // 2 for n in ns]
+
+def fibonacci_many(ns):
+    '''Returns the Fibonacci numbers of each n of ns, from a table
+       for the machine-word range and by fast doubling beyond it'''
+    ns = list(ns)
+    assert(all(n >= 0 for n in ns)), 'n must be >= 0'
+    table = FIBONACCI_TABLE
+    size = len(table)
+    return [table[n] if n < size else _fast_doubling(n) for n in ns]
         
 def main():
-    from timeit import Timer
+    from benchmark import format_result, run_benchmark
 
     to_execute = [
-        (number_sum, 
-         Timer('number_sum(300)', 'from __main__ import number_sum')),
-        (fibonacci, 
-         Timer('fibonacci(100)', 'from __main__ import fibonacci'))    
+        (number_sum, lambda: number_sum(300)),
+        (fibonacci, lambda: fibonacci(100))
     ]
     
-    for item in to_execute:
-        fn = item[0]
+    for fn, call in to_execute:
         print(f'Function "{fn.__name__}": {fn.__doc__}')
-        t = item[1]
-        print(f'Time: {t.timeit()}')
+        print(format_result(run_benchmark(fn.__name__, call)))
         print()
 
 if __name__ == '__main__': 
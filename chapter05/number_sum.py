@@ -6,12 +6,11 @@ def number_sum(n):
     
     if n in sum_cache:
         return sum_cache[n]
-    res = n + number_sum(n-1)
-    # Add the value to the cache
-    sum_cache[n] = res
+    # The closed form needs no recursion nor the smaller sums, so only
+    # the requested value is cached
+    res = sum_cache[n] = n * (n + 1) // 2
     return res
          
 if __name__ == '__main__': 
-    from timeit import Timer 
-    t = Timer('number_sum(300)', 'from __main__ import number_sum')
-    print('Time: ', t.timeit())
\ No newline at end of file
+    from benchmark import format_result, run_benchmark
+    print(format_result(run_benchmark('number_sum(300)', lambda: number_sum(300))))
\ No newline at end of file
@@ -3,12 +3,11 @@ def number_sum(n):
     '''Returns the sum of the first n numbers''' 
     assert(n >= 0), 'n must be >= 0' 
     
-    if n == 0:
-        return 0
-    else:
-        return n + number_sum(n-1)  
+    total = 0
+    for k in range(1, n + 1):
+        total += k
+    return total
  
 if __name__ == '__main__': 
-    from timeit import Timer 
-    t = Timer('number_sum(30)', 'from __main__ import number_sum')
-    print('Time: ', t.timeit())
\ No newline at end of file
+    from benchmark import format_result, run_benchmark
+    print(format_result(run_benchmark('number_sum(30)', lambda: number_sum(30))))
\ No newline at end of file
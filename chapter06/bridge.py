@@ -1,9 +1,13 @@
 
 
 import abc
+import codecs
+import sys
 import urllib.parse
 import urllib.request
 
+CHUNK_SIZE = 64 * 1024 # in bytes
+
 
 class ResourceContent:
     """
@@ -15,17 +19,60 @@ class ResourceContent:
         self._imp = imp
 
     def show_content(self, path):
-        self._imp.fetch(path)
+        self.pipe_content(path)
+        print()
+
+    def pipe_content(self, path, sink=None):
+        """
+        Write the content to sink (any object with a write() method taking
+        bytes, stdout by default) chunk by chunk, in constant memory.
+        A stdout without a binary buffer gets the content decoded as UTF-8.
+        """
+        if sink is None:
+            sys.stdout.flush()
+            sink = getattr(sys.stdout, 'buffer', None)
+        if sink is None:
+            sink = sys.stdout
+            decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+            for chunk in self._imp.chunks(path):
+                sink.write(decoder.decode(chunk))
+            sink.write(decoder.decode(b'', final=True))
+        else:
+            for chunk in self._imp.chunks(path):
+                sink.write(chunk)
+        if hasattr(sink, 'flush'):
+            sink.flush()
 
 
 class ResourceContentFetcher(metaclass=abc.ABCMeta):
     """
     Define the interface (Implementor) for implementation classes that help fetch content.
     """
+
+    def __init__(self, chunk_size=CHUNK_SIZE):
+        self.chunk_size = chunk_size
     
     @abc.abstractmethod
     def fetch(path):
         pass
+
+    @abc.abstractmethod
+    def chunks(self, path):
+        """
+        Yield the content as memoryviews over a single reused buffer of
+        chunk_size bytes: a chunk is only valid until the next one is
+        requested, copy it (bytes(chunk)) to keep it.
+        """
+        pass
+
+    def _read_chunks(self, stream):
+        buffer = bytearray(self.chunk_size)
+        view = memoryview(buffer)
+        while True:
+            size = stream.readinto(buffer)
+            if not size:
+                break
+            yield view[:size]
         
 
 class URLFetcher(ResourceContentFetcher):
@@ -41,6 +88,12 @@ class URLFetcher(ResourceContentFetcher):
             if response.code == 200:
                 the_page = response.read()
                 print(the_page)
+
+    def chunks(self, path):
+        # path is an URL
+        req = urllib.request.Request(path)
+        with urllib.request.urlopen(req) as response:
+            yield from self._read_chunks(response)
                         
                 
 class LocalFileFetcher(ResourceContentFetcher):
@@ -53,6 +106,11 @@ class LocalFileFetcher(ResourceContentFetcher):
         # path is the filepath to a text file
         with open(path) as f:
             print(f.read())
+
+    def chunks(self, path):
+        # path is the filepath to a file, read straight into the buffer
+        with open(path, 'rb', buffering=0) as f:
+            yield from self._read_chunks(f)
         
        
 def main():